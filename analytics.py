@@ -0,0 +1,204 @@
+import argparse
+import os
+import pandas as pd
+from catalogue import CACHE_DIR, SessionCatalogue
+
+ANALYTICS_DIR = os.path.join(CACHE_DIR, "analytics")
+ANALYTICS_VERSION = 2
+
+# Lap time gained per lap of fuel burned, a common rule of thumb for current cars
+FUEL_SECONDS_PER_LAP = 0.03
+OUTLIER_RATIO = 1.07
+
+STINT_KEYS = ["DriverNumber", "Stint", "Compound"]
+SUM_COLUMNS = ["n", "x", "y", "sxx", "sxy"]
+
+
+def stint_laps(laps):
+    laps = laps[["DriverNumber", "LapNumber", "Stint", "Compound", "TyreLife", "PitOutTime"]].copy()
+    laps["DriverNumber"] = laps["DriverNumber"].astype(str)
+    laps = laps.dropna(subset=["LapNumber"]).sort_values(["DriverNumber", "LapNumber"])
+
+    # Fall back to pit exits and compound changes where the timing feed has no stint number
+    new_stint = laps["PitOutTime"].notna() | (laps["Compound"] != laps.groupby("DriverNumber")["Compound"].shift())
+    derived = new_stint.astype(int).groupby(laps["DriverNumber"]).cumsum()
+    laps["Stint"] = laps["Stint"].fillna(derived).astype(int)
+
+    stint_start = laps.groupby(["DriverNumber", "Stint"])["LapNumber"].transform("min")
+    laps["TyreAge"] = laps["TyreLife"].fillna(laps["LapNumber"] - stint_start + 1).astype(int)
+    laps["LapNumber"] = laps["LapNumber"].astype(int)
+    return laps[["DriverNumber", "LapNumber", "Stint", "Compound", "TyreAge"]]
+
+
+def stint_table(laps):
+    return (
+        stint_laps(laps)
+        .groupby(["DriverNumber", "Stint"])
+        .agg(
+            Compound=("Compound", "first"),
+            FirstLap=("LapNumber", "min"),
+            LastLap=("LapNumber", "max"),
+            Laps=("LapNumber", "size"),
+            StartAge=("TyreAge", "min"),
+        )
+        .reset_index()
+    )
+
+
+def clean_laps(laps, total_laps=None):
+    # Stints come from the full lap list, before pit laps are filtered out
+    stints = stint_laps(laps)
+    laps = laps.copy()
+    laps["DriverNumber"] = laps["DriverNumber"].astype(str)
+    laps["LapTimeS"] = laps["LapTime"].dt.total_seconds()
+
+    keep = (
+        laps["LapTimeS"].notna()
+        & laps["PitInTime"].isna()
+        & laps["PitOutTime"].isna()
+        & (laps["LapNumber"] > 1)
+        & laps["Compound"].notna()
+    )
+    if "TrackStatus" in laps.columns:
+        keep &= laps["TrackStatus"].astype(str) == "1"
+    if "Deleted" in laps.columns:
+        keep &= ~laps["Deleted"].fillna(False).astype(bool)
+    laps = laps[keep]
+
+    driver_median = laps.groupby("DriverNumber")["LapTimeS"].transform("median")
+    laps = laps[laps["LapTimeS"] <= driver_median * OUTLIER_RATIO].copy()
+
+    if total_laps is None:
+        total_laps = int(laps["LapNumber"].max()) if not laps.empty else 0
+    laps["FuelCorrectedS"] = laps["LapTimeS"] - FUEL_SECONDS_PER_LAP * (total_laps - laps["LapNumber"])
+
+    return laps.drop(columns=["Stint"], errors="ignore").merge(
+        stints[["DriverNumber", "LapNumber", "Stint", "TyreAge"]], on=["DriverNumber", "LapNumber"]
+    )
+
+
+def regression_sums(clean, by):
+    # Sums are centred on each stint's own means, so differences in driver pace and
+    # pit timing between stints don't leak into the pooled slope
+    frame = clean[STINT_KEYS].copy()
+    frame["n"] = 1
+    frame["x"] = clean["TyreAge"].astype(float)
+    frame["y"] = clean["FuelCorrectedS"]
+    stints = frame.groupby(STINT_KEYS)
+    dx = frame["x"] - stints["x"].transform("mean")
+    dy = frame["y"] - stints["y"].transform("mean")
+    frame["sxx"] = dx * dx
+    frame["sxy"] = dx * dy
+    return frame.groupby(by)[SUM_COLUMNS].sum().reset_index()
+
+
+def fit_sums(sums):
+    # Within-stint least squares slope from pooled sums, so sessions can be combined exactly;
+    # the base lap is the mean of each stint's intercept, weighted by its laps
+    slope = sums["sxy"] / sums["sxx"].where(sums["sxx"] > 0)
+    intercept = (sums["y"] - slope * sums["x"]) / sums["n"]
+    return sums.assign(DegradationSPerLap=slope, BaseLapS=intercept, Laps=sums["n"])
+
+
+def degradation(clean):
+    stints = fit_sums(regression_sums(clean, STINT_KEYS))
+    compounds = fit_sums(regression_sums(clean, ["Compound"]))
+    compounds["Stints"] = compounds["Compound"].map(stints.groupby("Compound").size()).fillna(0).astype(int)
+    stints = stints[["DriverNumber", "Stint", "Compound", "DegradationSPerLap", "BaseLapS", "Laps"]]
+    return compounds[["Compound", "DegradationSPerLap", "BaseLapS", "Laps", "Stints"]], stints
+
+
+def pace_distribution(clean):
+    grouped = clean.groupby("DriverNumber")["FuelCorrectedS"]
+    pace = grouped.describe(percentiles=[0.1, 0.25, 0.5, 0.75, 0.9])
+    return pace.rename(columns={"50%": "median"}).sort_values("median").reset_index()
+
+
+def session_analytics(laps, total_laps=None):
+    clean = clean_laps(laps, total_laps)
+    compounds, stints = degradation(clean)
+    return {
+        "stints": stint_table(laps),
+        "degradation": compounds,
+        "stint_degradation": stints,
+        "pace": pace_distribution(clean),
+        "sums": regression_sums(clean, ["Compound"]),
+    }
+
+
+def memo_path(year, event_name, session_type):
+    name = f"{year}_{event_name}_{session_type}_v{ANALYTICS_VERSION}.pkl".replace(" ", "_")
+    return os.path.join(ANALYTICS_DIR, name)
+
+
+def cached_session_analytics(year, event_name, session_type):
+    path = memo_path(year, event_name, session_type)
+    if os.path.exists(path):
+        return pd.read_pickle(path)
+
+    import fastf1
+
+    fastf1.Cache.enable_cache(CACHE_DIR)
+    session = fastf1.get_session(year, event_name, session_type)
+    session.load(laps=True, telemetry=False, weather=False, messages=False)
+    total_laps = getattr(session, "total_laps", None)
+    result = session_analytics(session.laps, total_laps)
+
+    os.makedirs(ANALYTICS_DIR, exist_ok=True)
+    pd.to_pickle(result, path)
+    return result
+
+
+def season_analytics(year, session_type="R", catalogue=None):
+    catalogue = catalogue or SessionCatalogue().build()
+    events = sorted(
+        (e for (y, _), e in catalogue.events.items() if y == str(year)),
+        key=lambda e: e.name,
+    )
+
+    per_event = []
+    for event in events:
+        if not catalogue.is_cached(event.name, year, session_type):
+            continue
+        try:
+            per_event.append((event.name, cached_session_analytics(year, event.name, session_type)))
+        except Exception as e:
+            print(f"  Skipping {event.name}: {e}")
+
+    if not per_event:
+        return None
+
+    def combined(key):
+        return pd.concat([r[key].assign(Event=name) for name, r in per_event], ignore_index=True)
+
+    sums = combined("sums").groupby("Compound")[SUM_COLUMNS].sum().reset_index()
+    season = fit_sums(sums)[["Compound", "DegradationSPerLap", "BaseLapS", "Laps"]]
+    return {
+        "events": [name for name, _ in per_event],
+        "degradation": season,
+        "event_degradation": combined("degradation"),
+        "stints": combined("stints"),
+        "pace": combined("pace"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stint, degradation and pace analytics over cached sessions")
+    parser.add_argument("year", type=int)
+    parser.add_argument("--session", default="R")
+    args = parser.parse_args()
+
+    result = season_analytics(args.year, args.session)
+    if result is None:
+        print(f"No cached {args.session} sessions found for {args.year}")
+        return
+
+    print(f"{len(result['events'])} events: {', '.join(result['events'])}")
+    print("\nDegradation per compound (fuel corrected, s/lap):")
+    print(result["degradation"].to_string(index=False))
+    print("\nPer-event degradation:")
+    print(result["event_degradation"].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
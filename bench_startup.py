@@ -0,0 +1,66 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+DEFAULT_BUDGET_S = 1.5
+
+
+def measure_once():
+    env = dict(os.environ, F1_STARTUP_BENCH="1", SDL_VIDEODRIVER=os.environ.get("SDL_VIDEODRIVER", "dummy"))
+    env.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "main.py"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+
+    for line in proc.stdout:
+        if line.startswith("FIRST_MENU_FRAME"):
+            wall = time.perf_counter() - start
+            parts = line.split()
+            heavy = parts[2].split(",") if len(parts) > 2 else []
+            # main.py keeps drawing until the background imports finish, so a failed import fails the run
+            if proc.wait() != 0:
+                raise RuntimeError(f"main.py exited with code {proc.returncode} after the first menu frame")
+            return wall, heavy
+
+    proc.wait()
+    raise RuntimeError(f"main.py exited with code {proc.returncode} before drawing the menu")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time from launch to the first menu frame")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_S, help="maximum median seconds to first frame")
+    args = parser.parse_args()
+
+    timings = []
+    heavy = []
+    for i in range(args.runs):
+        wall, heavy = measure_once()
+        timings.append(wall)
+        print(f"run {i + 1}: {wall:.3f}s")
+
+    median = statistics.median(timings)
+    print(f"median time to first menu frame: {median:.3f}s (budget {args.budget:.2f}s)")
+
+    failed = False
+    if heavy:
+        print(f"FAIL: imported before the first menu frame: {', '.join(heavy)}")
+        failed = True
+    if median > args.budget:
+        print("FAIL: startup is over budget")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+import math
+from collections import OrderedDict
+import numpy as np
+import pygame
+
+TILE_SIZE = 512
+MIN_ZOOM = 1.0
+MAX_ZOOM = 16.0
+# Rendered tiles kept per camera, in multiples of the tiles one screen needs
+TILE_CACHE_SCREENS = 3
+
+
+class SpatialGrid:
+    def __init__(self, min_x, min_y, max_x, max_y, cells=32):
+        self.cell_size = max(max_x - min_x, max_y - min_y) / cells
+        self.min_x = min_x
+        self.min_y = min_y
+        self.nx = max(1, int(math.ceil((max_x - min_x) / self.cell_size)))
+        self.ny = max(1, int(math.ceil((max_y - min_y) / self.cell_size)))
+
+    def cell_ids(self, xs, ys):
+        cx = np.floor((np.asarray(xs, dtype=float) - self.min_x) / self.cell_size)
+        cy = np.floor((np.asarray(ys, dtype=float) - self.min_y) / self.cell_size)
+        cx = np.clip(np.nan_to_num(cx), 0, self.nx - 1).astype(int)
+        cy = np.clip(np.nan_to_num(cy), 0, self.ny - 1).astype(int)
+        return cy * self.nx + cx
+
+    def cells_in_rect(self, x0, y0, x1, y1):
+        cx0, cy0 = self._cell_coords(x0, y0)
+        cx1, cy1 = self._cell_coords(x1, y1)
+
+        mask = np.zeros((self.ny, self.nx), dtype=bool)
+        mask[cy0:cy1 + 1, cx0:cx1 + 1] = True
+        return mask.ravel()
+
+    def _cell_coords(self, x, y):
+        cx = int((x - self.min_x) // self.cell_size)
+        cy = int((y - self.min_y) // self.cell_size)
+        return min(max(cx, 0), self.nx - 1), min(max(cy, 0), self.ny - 1)
+
+
+class Camera:
+    def __init__(self, track_x, track_y, width, height, left_margin=None):
+        self.width = width
+        self.height = height
+        self.track_x = np.asarray(track_x, dtype=float)
+        self.track_y = np.asarray(track_y, dtype=float)
+
+        min_x, max_x = self.track_x.min(), self.track_x.max()
+        min_y, max_y = self.track_y.min(), self.track_y.max()
+        track_w = max_x - min_x
+        track_h = max_y - min_y
+
+        self.mid_x = (min_x + max_x) / 2
+        self.mid_y = (min_y + max_y) / 2
+        self.anchor_y = height / 2
+        if left_margin is None:
+            self.base_scale = min(width / track_w, height / track_h) * 0.7
+            self.anchor_x = width / 2 + 100
+        else:
+            self.base_scale = min((width - left_margin) / track_w, height / track_h) * 0.9
+            self.anchor_x = left_margin + (width - left_margin) / 2
+
+        # Pad the grid so cars in the pit lane or run-off still land in a real cell
+        pad = max(track_w, track_h) * 0.1
+        self.grid = SpatialGrid(min_x - pad, min_y - pad, max_x + pad, max_y + pad)
+        self.segment_start_cells = self.grid.cell_ids(self.track_x, self.track_y)
+        self.segment_end_cells = np.roll(self.segment_start_cells, -1)
+
+        self.zoom = 1.0
+        self.centre_x = self.mid_x
+        self.centre_y = self.mid_y
+        self.follow_driver = None
+
+        self.tiles = OrderedDict()
+        self.layer_points = None
+        self.layer_zoom = None
+        self.segment_groups = None
+        self.palette = None
+        self.style_version = 0
+
+    @property
+    def scale(self):
+        return self.base_scale * self.zoom
+
+    def reset(self):
+        self.zoom = 1.0
+        self.centre_x = self.mid_x
+        self.centre_y = self.mid_y
+        self.follow_driver = None
+
+    def world_to_screen(self, x, y):
+        sx = (np.asarray(x) - self.centre_x) * self.scale + self.anchor_x
+        sy = self.anchor_y - (np.asarray(y) - self.centre_y) * self.scale
+        return sx, sy
+
+    def screen_to_world(self, sx, sy):
+        x = (sx - self.anchor_x) / self.scale + self.centre_x
+        y = (self.anchor_y - sy) / self.scale + self.centre_y
+        return x, y
+
+    def pan(self, dx, dy):
+        self.follow_driver = None
+        self.centre_x -= dx / self.scale
+        self.centre_y += dy / self.scale
+
+    def zoom_at(self, factor, screen_pos=None):
+        new_zoom = min(MAX_ZOOM, max(MIN_ZOOM, self.zoom * factor))
+        if new_zoom == self.zoom:
+            return
+
+        if screen_pos is None or self.follow_driver is not None:
+            self.zoom = new_zoom
+            return
+
+        wx, wy = self.screen_to_world(*screen_pos)
+        self.zoom = new_zoom
+        self.centre_x = wx - (screen_pos[0] - self.anchor_x) / self.scale
+        self.centre_y = wy + (screen_pos[1] - self.anchor_y) / self.scale
+
+    def update_follow(self, frame):
+        if self.follow_driver is None:
+            return
+
+        driver = frame["drivers"].get(self.follow_driver)
+        if driver is None:
+            self.follow_driver = None
+            return
+
+        self.centre_x = driver["x"]
+        self.centre_y = driver["y"]
+
+    def visible_cells(self, margin_px=40):
+        x0, y1 = self.screen_to_world(-margin_px, -margin_px)
+        x1, y0 = self.screen_to_world(self.width + margin_px, self.height + margin_px)
+        return self.grid.cells_in_rect(x0, y0, x1, y1)
+
+    def visible_mask(self, xs, ys, cells=None):
+        if cells is None:
+            cells = self.visible_cells()
+        return cells[self.grid.cell_ids(xs, ys)]
+
+    def set_track_style(self, segment_groups=None, palette=None):
+        if segment_groups is None and self.segment_groups is None:
+            return
+        if (
+            segment_groups is not None and self.segment_groups is not None
+            and palette == self.palette and np.array_equal(segment_groups, self.segment_groups)
+        ):
+            return
+
+        self.segment_groups = segment_groups
+        self.palette = palette
+        self.style_version += 1
+        self.tiles = OrderedDict()
+
+    def draw_track(self, screen, colour=(80, 80, 80)):
+        if len(self.track_x) <= 2:
+            return
+
+        if self.layer_zoom != self.zoom:
+            self._rebuild_layer()
+
+        scale = self.scale
+        origin_x = (self.centre_x - self.mid_x) * scale - self.anchor_x
+        origin_y = -(self.centre_y - self.mid_y) * scale - self.anchor_y
+
+        first_i = int(origin_x // TILE_SIZE)
+        first_j = int(origin_y // TILE_SIZE)
+        last_i = int((origin_x + self.width) // TILE_SIZE)
+        last_j = int((origin_y + self.height) // TILE_SIZE)
+
+        for j in range(first_j, last_j + 1):
+            for i in range(first_i, last_i + 1):
+                tile = self.tiles.get((i, j))
+                if tile is None:
+                    tile = self._render_tile(i, j, colour)
+                    self.tiles[(i, j)] = tile
+                else:
+                    self.tiles.move_to_end((i, j))
+                if tile is not False:
+                    screen.blit(tile, (int(i * TILE_SIZE - origin_x), int(j * TILE_SIZE - origin_y)))
+
+        # Following a car at high zoom keeps uncovering new tiles, so drop the least recently drawn
+        limit = TILE_CACHE_SCREENS * (last_i - first_i + 1) * (last_j - first_j + 1)
+        while len(self.tiles) > limit:
+            self.tiles.popitem(last=False)
+
+    def _rebuild_layer(self):
+        scale = self.scale
+        layer_x = (self.track_x - self.mid_x) * scale
+        layer_y = -(self.track_y - self.mid_y) * scale
+        points = np.column_stack((layer_x, layer_y))
+        self.layer_points = np.vstack((points, points[:1]))
+        self.layer_zoom = self.zoom
+        self.tiles = OrderedDict()
+
+    def _render_tile(self, i, j, colour):
+        scale = self.scale
+        margin = 4
+        x0 = self.mid_x + (i * TILE_SIZE - margin) / scale
+        x1 = self.mid_x + ((i + 1) * TILE_SIZE + margin) / scale
+        y0 = self.mid_y - ((j + 1) * TILE_SIZE + margin) / scale
+        y1 = self.mid_y - (j * TILE_SIZE - margin) / scale
+
+        cells = self.grid.cells_in_rect(x0, y0, x1, y1)
+        segments = np.flatnonzero(cells[self.segment_start_cells] | cells[self.segment_end_cells])
+        if len(segments) == 0:
+            # Empty tiles are remembered too so they are not re-tested every frame
+            return False
+
+        tile = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+        offset = np.array([i * TILE_SIZE, j * TILE_SIZE], dtype=float)
+
+        splits = np.diff(segments) != 1
+        if self.segment_groups is not None:
+            groups = self.segment_groups[segments]
+            splits |= np.diff(groups) != 0
+
+        for run in np.split(segments, np.flatnonzero(splits) + 1):
+            run_colour = colour
+            if self.segment_groups is not None:
+                run_colour = self.palette[self.segment_groups[run[0]]]
+            pts = self.layer_points[run[0]:run[-1] + 2] - offset
+            pygame.draw.aalines(tile, run_colour, False, pts.tolist())
+
+        return tile
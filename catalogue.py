@@ -0,0 +1,259 @@
+import bisect
+import json
+import os
+import re
+import sys
+import unicodedata
+
+CACHE_DIR = "cache"
+CATALOGUE_FILE = "catalogue.json"
+
+SESSION_ALIASES = {
+    "R": "Race",
+    "Q": "Qualifying",
+    "S": "Sprint",
+    "SQ": "Sprint Qualifying",
+    "SS": "Sprint Shootout",
+    "FP1": "Practice 1",
+    "FP2": "Practice 2",
+    "FP3": "Practice 3",
+}
+
+SESSION_ABBREVIATIONS = {name: abbr for abbr, name in SESSION_ALIASES.items()}
+
+# The sprint qualifying session was called the Sprint Shootout in 2023
+SPRINT_QUALIFYING_NAMES = ("Sprint Qualifying", "Sprint Shootout")
+
+
+def session_name(session_type):
+    text = session_type.strip()
+    if text.upper() in SESSION_ALIASES:
+        return SESSION_ALIASES[text.upper()]
+    for name in SESSION_ABBREVIATIONS:
+        if name.lower() == text.lower():
+            return name
+    return None
+
+
+def fold_name(text):
+    # "São Paulo", "sao-paulo" and "SAO PAULO" all fold to "sao paulo"
+    text = unicodedata.normalize("NFKD", text.strip())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(re.split(r"[^0-9a-z]+", text.lower())).strip()
+
+
+def load_catalogue_file(cache_dir=CACHE_DIR):
+    path = os.path.join(cache_dir, CATALOGUE_FILE)
+    if not os.path.exists(path):
+        return {}
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Catalogue read error: {e}")
+        return {}
+
+
+def update_catalogue(year, schedule, cache_dir=CACHE_DIR):
+    data = load_catalogue_file(cache_dir)
+    events = {}
+
+    for _, row in schedule.iterrows():
+        sessions = []
+        for i in range(1, 6):
+            name = row.get(f"Session{i}")
+            if isinstance(name, str) and name and name != "None":
+                sessions.append(name)
+
+        events[str(row["EventName"])] = {
+            "location": str(row.get("Location", "")),
+            "country": str(row.get("Country", "")),
+            "sessions": sessions,
+        }
+
+    data[str(year)] = events
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(os.path.join(cache_dir, CATALOGUE_FILE), "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def scan_cached_sessions(cache_dir=CACHE_DIR):
+    # fastf1 lays its cache out as <year>/<date>_<Event_Name>/<date>_<Session_Name>/
+    cached = {}
+    if not os.path.isdir(cache_dir):
+        return cached
+
+    for year in os.listdir(cache_dir):
+        year_dir = os.path.join(cache_dir, year)
+        if not year.isdigit() or not os.path.isdir(year_dir):
+            continue
+
+        for event_entry in os.listdir(year_dir):
+            event_dir = os.path.join(year_dir, event_entry)
+            if not os.path.isdir(event_dir):
+                continue
+            event_name = event_entry.split("_", 1)[-1].replace("_", " ")
+
+            for session_entry in os.listdir(event_dir):
+                session_dir = os.path.join(event_dir, session_entry)
+                if not os.path.isdir(session_dir):
+                    continue
+                if not any(f.endswith(".ff1pkl") for f in os.listdir(session_dir)):
+                    continue
+
+                name = session_entry.split("_", 1)[-1].replace("_", " ")
+                cached.setdefault((year, event_name), set()).add(name)
+
+    return cached
+
+
+class CatalogueEvent:
+    def __init__(self, year, name, location="", country="", sessions=None):
+        self.year = year
+        self.name = name
+        self.location = location
+        self.country = country
+        self.sessions = list(sessions or [])
+        self.cached = set()
+
+    def aliases(self):
+        return [n for n in (self.name, self.location, self.country) if n]
+
+
+class PrefixIndex:
+    def __init__(self, options):
+        self.options = sorted(set(options), key=str.lower)
+        self.keys = [o.lower() for o in self.options]
+
+    def complete(self, prefix):
+        if not prefix:
+            return None
+
+        prefix = prefix.lower()
+        idx = bisect.bisect_left(self.keys, prefix)
+        if idx < len(self.keys) and self.keys[idx].startswith(prefix):
+            return self.options[idx]
+        return None
+
+
+class SessionCatalogue:
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.events = {}
+        self.lookup = {}
+        self.aliases_by_year = {}
+        self.years = []
+        self.scheduled_years = set()
+        self.year_index = PrefixIndex([])
+        self.name_index = PrefixIndex([])
+        self.name_index_by_year = {}
+
+    def build(self):
+        for year, events in load_catalogue_file(self.cache_dir).items():
+            self.scheduled_years.add(year)
+            for name, info in events.items():
+                self.events[(year, name)] = CatalogueEvent(
+                    year, name, info.get("location", ""), info.get("country", ""), info.get("sessions")
+                )
+
+        for (year, name), sessions in scan_cached_sessions(self.cache_dir).items():
+            event = self.events.get((year, name))
+            if event is None:
+                event = CatalogueEvent(year, name, sessions=sorted(sessions))
+                self.events[(year, name)] = event
+            event.cached |= sessions
+            for session in sessions:
+                if session not in event.sessions:
+                    event.sessions.append(session)
+
+        # Everything the menu asks for per keystroke is a dict lookup or a bisect, never I/O
+        names_by_year = {}
+        for (year, _), event in self.events.items():
+            for alias in event.aliases():
+                events = self.lookup.setdefault((year, fold_name(alias)), [])
+                if event not in events:
+                    events.append(event)
+                self.aliases_by_year.setdefault(year, []).append((fold_name(alias), event))
+                names_by_year.setdefault(year, []).append(alias)
+
+        self.years = sorted(names_by_year)
+        self.year_index = PrefixIndex(self.years)
+        self.name_index = PrefixIndex([n for names in names_by_year.values() for n in names])
+        self.name_index_by_year = {y: PrefixIndex(names) for y, names in names_by_year.items()}
+        print(f"Catalogue built: {len(self.events)} events, {sum(len(e.cached) for e in self.events.values())} cached sessions")
+        return self
+
+    def match_events(self, location, year):
+        key = fold_name(location)
+        if not key:
+            return []
+
+        exact = self.lookup.get((str(year), key), [])
+        if len(exact) == 1:
+            return exact
+
+        # Like fastf1's own lookup, accept part of a name: "Spa", "Italian", "Abu Dhabi"
+        aliases = self.aliases_by_year.get(str(year), [])
+        for matches in (
+            [e for alias, e in aliases if alias.startswith(key)],
+            [e for alias, e in aliases if f" {key}" in f" {alias}"],
+            [e for alias, e in aliases if key in alias],
+        ):
+            if matches:
+                return list(dict.fromkeys(matches))
+        return []
+
+    def find_event(self, location, year):
+        matches = self.match_events(location, year)
+        return matches[0] if len(matches) == 1 else None
+
+    def complete_year(self, prefix):
+        return self.year_index.complete(prefix)
+
+    def complete_location(self, prefix, year=None):
+        return self.name_index_by_year.get(str(year), self.name_index).complete(prefix)
+
+    def complete_session(self, prefix, location, year):
+        event = self.find_event(location, year)
+        if event is None:
+            return None
+
+        return PrefixIndex(SESSION_ABBREVIATIONS.get(s, s) for s in event.sessions).complete(prefix)
+
+    def validate(self, location, year, session_type):
+        name = session_name(session_type)
+        if name is None:
+            return f"Unknown session type '{session_type}'"
+
+        if str(year) not in self.scheduled_years:
+            # Without the season schedule only the session type can be checked
+            return None
+
+        events = self.match_events(location, year)
+        if not events:
+            return f"No event '{location}' in {year}"
+
+        # An ambiguous name is left for fastf1 to resolve, unless none of the candidates has the session
+        names = SPRINT_QUALIFYING_NAMES if name in SPRINT_QUALIFYING_NAMES else (name,)
+        if all(e.sessions and not any(n in e.sessions for n in names) for e in events):
+            return f"{events[0].name} {year} has no {name}" if len(events) == 1 else f"No '{location}' event in {year} has a {name}"
+
+        return None
+
+    def is_cached(self, location, year, session_type):
+        event = self.find_event(location, year)
+        name = session_name(session_type)
+        names = SPRINT_QUALIFYING_NAMES if name in SPRINT_QUALIFYING_NAMES else (name,)
+        return event is not None and any(n in event.cached for n in names)
+
+
+if __name__ == "__main__":
+    import fastf1
+
+    fastf1.Cache.enable_cache(CACHE_DIR)
+    for arg in sys.argv[1:]:
+        update_catalogue(int(arg), fastf1.get_event_schedule(int(arg), include_testing=False))
+        print(f"Catalogue updated for {arg}")
+
+    SessionCatalogue().build()
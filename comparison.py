@@ -0,0 +1,147 @@
+from collections import OrderedDict
+import numpy as np
+import pygame
+
+DISTANCE_STEP = 5.0
+LAP_CACHE_SIZE = 32
+
+
+class ResampledLap:
+    def __init__(self, driver, lap_number, distance, time, x, y):
+        self.driver = driver
+        self.lap_number = lap_number
+        self.distance = distance
+        self.time = time
+        self.x = x
+        self.y = y
+
+    @property
+    def lap_time(self):
+        return float(self.time[-1])
+
+
+class LapCache:
+    def __init__(self, race, maxsize=LAP_CACHE_SIZE):
+        self.race = race
+        self.maxsize = maxsize
+        self.laps = OrderedDict()
+        self.last_laps = {}
+
+    def get(self, driver, lap_number):
+        key = (str(driver), int(lap_number))
+        if key in self.laps:
+            self.laps.move_to_end(key)
+            return self.laps[key]
+
+        # Retirement laps and laps without position data can make fastf1 raise; remember them as unusable
+        try:
+            lap = resample_lap(self.race, *key)
+        except Exception as e:
+            print(f"  Skipping lap {key[1]} of {key[0]}: {e}")
+            lap = None
+        self.laps[key] = lap
+        if len(self.laps) > self.maxsize:
+            self.laps.popitem(last=False)
+        return lap
+
+    def last_lap(self, driver):
+        driver = str(driver)
+        if driver not in self.last_laps:
+            laps = self.race.session.laps.pick_drivers(driver)["LapNumber"].dropna()
+            self.last_laps[driver] = int(laps.max()) if len(laps) else 1
+        return self.last_laps[driver]
+
+
+def resample_lap(race, driver, lap_number, step=DISTANCE_STEP):
+    laps = race.session.laps.pick_drivers(driver).pick_laps(lap_number)
+    if laps.empty:
+        return None
+
+    telemetry = laps.iloc[0].get_telemetry()
+    if telemetry is None or len(telemetry) < 2:
+        return None
+
+    # Telemetry distance can step backwards slightly where position and car data merge
+    distance = np.maximum.accumulate(telemetry["Distance"].to_numpy(dtype=float))
+    distance -= distance[0]
+    if distance[-1] <= step:
+        return None
+
+    time = telemetry["Time"].dt.total_seconds().to_numpy(dtype=float)
+    time -= time[0]
+
+    cos, sin = np.cos(race.track_rotation), np.sin(race.track_rotation)
+    raw_x = telemetry["X"].to_numpy(dtype=float)
+    raw_y = telemetry["Y"].to_numpy(dtype=float)
+
+    grid = np.arange(0.0, distance[-1], step)
+    return ResampledLap(
+        str(driver),
+        int(lap_number),
+        grid,
+        np.interp(grid, distance, time),
+        np.interp(grid, distance, raw_x * cos - raw_y * sin),
+        np.interp(grid, distance, raw_x * sin + raw_y * cos),
+    )
+
+
+class LapComparison:
+    def __init__(self, lap_a, lap_b):
+        self.lap_a = lap_a
+        self.lap_b = lap_b
+
+        # Both laps share the same grid origin and step, so aligning is a truncation
+        count = min(len(lap_a.distance), len(lap_b.distance))
+        self.distance = lap_a.distance[:count]
+        self.delta = lap_b.time[:count] - lap_a.time[:count]
+        self.duration = max(lap_a.lap_time, lap_b.lap_time)
+
+    def positions(self, elapsed):
+        result = []
+        for lap in (self.lap_a, self.lap_b):
+            t = min(elapsed, lap.lap_time)
+            d = np.interp(t, lap.time, lap.distance)
+            result.append((np.interp(d, lap.distance, lap.x), np.interp(d, lap.distance, lap.y), d))
+        return result
+
+    def delta_at(self, distance):
+        return float(np.interp(distance, self.distance, self.delta))
+
+
+def draw_ghost(screen, pos, colour, label, font):
+    pygame.draw.circle(screen, colour, pos, 9, 3)
+    text = font.render(label, True, colour)
+    screen.blit(text, text.get_rect(center=(pos[0], pos[1] + 20)))
+
+
+def draw_compare_message(screen, rect, font, text):
+    pygame.draw.rect(screen, (25, 25, 25), rect, border_radius=5)
+    pygame.draw.rect(screen, (180, 180, 180), rect, 2, border_radius=5)
+    message = font.render(text, True, (255, 120, 120))
+    screen.blit(message, message.get_rect(center=rect.center))
+
+
+def draw_delta_trace(screen, rect, comparison, elapsed, font, title=""):
+    pygame.draw.rect(screen, (25, 25, 25), rect, border_radius=5)
+    pygame.draw.rect(screen, (180, 180, 180), rect, 2, border_radius=5)
+
+    (_, _, dist_a), _ = comparison.positions(elapsed)
+    delta_now = comparison.delta_at(dist_a)
+    header = f"{title}  delta {delta_now:+.3f}s" if title else f"delta {delta_now:+.3f}s"
+    screen.blit(font.render(header, True, (255, 255, 255)), (rect.x + 10, rect.y + 6))
+
+    if len(comparison.distance) < 2:
+        return
+
+    plot = pygame.Rect(rect.x + 10, rect.y + 26, rect.width - 20, rect.height - 32)
+    limit = max(float(np.abs(comparison.delta).max()), 0.1)
+    zero_y = plot.centery
+    pygame.draw.line(screen, (90, 90, 90), (plot.x, zero_y), (plot.right, zero_y), 1)
+
+    total = comparison.distance[-1] or 1.0
+    xs = plot.x + comparison.distance / total * plot.width
+    ys = zero_y - comparison.delta / limit * (plot.height / 2)
+    pygame.draw.lines(screen, (255, 200, 60), False, np.column_stack((xs, ys)).tolist(), 2)
+
+    cursor_x = plot.x + int(min(dist_a / total, 1.0) * plot.width)
+    pygame.draw.line(screen, (255, 255, 255), (cursor_x, plot.y), (cursor_x, plot.bottom), 1)
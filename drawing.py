@@ -0,0 +1,16 @@
+import pygame
+
+WIDTH, HEIGHT = 1600, 900
+
+def draw_car(screen, color, pos, name_text, name_rect):
+    pygame.draw.circle(screen, color, pos, 8)
+    pygame.draw.circle(screen, (255, 255, 255), pos, 8, 2)
+    screen.blit(name_text, name_rect)
+
+def draw_loading(screen, text):
+    screen.fill((20, 20, 20))
+    font = pygame.font.Font(None, 48)
+    surf = font.render(text, True, (255, 255, 255))
+    rect = surf.get_rect(center=(WIDTH//2, HEIGHT//2))
+    screen.blit(surf, rect)
+    pygame.display.flip()
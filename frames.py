@@ -0,0 +1,236 @@
+import numpy as np
+
+
+class CompactFrames:
+    def __init__(self, times, driver_numbers, driver_info, x, y, active, laps):
+        self.times = times
+        self.driver_numbers = list(driver_numbers)
+        self.driver_info = driver_info
+        self.x = x
+        self.y = y
+        self.active = active
+        self.laps = laps
+
+    def __len__(self):
+        return len(self.times)
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("frame index out of range")
+
+        # Rebuild the per-frame dict layout the renderer and leaderboard expect
+        lap = int(self.laps[idx])
+        xs = self.x[idx].tolist()
+        ys = self.y[idx].tolist()
+        active = self.active[idx].tolist()
+        drivers = {}
+        for i, driver_number in enumerate(self.driver_numbers):
+            info = self.driver_info[driver_number]
+            drivers[driver_number] = {
+                "x": xs[i],
+                "y": ys[i],
+                "lap": lap,
+                "abbreviation": info["abbreviation"],
+                "colour": info["colour"],
+                "active": active[i],
+            }
+
+        return {"time": float(self.times[idx]), "drivers": drivers}
+
+    @property
+    def duration(self):
+        return float(self.times[-1]) if len(self.times) else 0.0
+
+    def trajectory(self, driver_number):
+        if driver_number not in self.driver_numbers:
+            return np.empty(0), np.empty(0), np.empty(0)
+        i = self.driver_numbers.index(driver_number)
+        count = int(self.active[:, i].sum())
+        return self.times[:count], self.x[:count, i].astype(float), self.y[:count, i].astype(float)
+
+    @property
+    def nbytes(self):
+        return self.times.nbytes + self.x.nbytes + self.y.nbytes + self.active.nbytes + self.laps.nbytes
+
+
+def build_compact_frames(driver_data, times, laps):
+    driver_numbers = list(driver_data.keys())
+    x = np.empty((len(times), len(driver_numbers)), dtype=np.float32)
+    y = np.empty_like(x)
+    active = np.empty(x.shape, dtype=bool)
+
+    for i, driver_number in enumerate(driver_numbers):
+        data = driver_data[driver_number]
+        ts = data["timestamps"]
+        # np.interp clamps past the last sample, which is where retired cars are parked
+        x[:, i] = np.interp(times, ts, data["x"])
+        y[:, i] = np.interp(times, ts, data["y"])
+        active[:, i] = times <= ts[-1]
+
+    driver_info = {
+        d: {"abbreviation": driver_data[d]["abbreviation"], "colour": driver_data[d]["colour"]}
+        for d in driver_numbers
+    }
+    return CompactFrames(times, driver_numbers, driver_info, x, y, active, laps.astype(np.int16))
+
+
+def simplify_trajectory(t, x, y, tolerance):
+    # Top-down Douglas-Peucker on synchronized distance, splitting every bad segment per pass.
+    # Points drop out once their segment is within tolerance, so later passes only revisit the rest
+    n = len(t)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    active = np.arange(1, n - 1)
+
+    while len(active):
+        knots = np.flatnonzero(keep)
+        seg = np.searchsorted(knots, active, side="right") - 1
+        start, end = knots[seg], knots[seg + 1]
+
+        span = t[end] - t[start]
+        frac = np.divide(t[active] - t[start], span, out=np.zeros(len(active)), where=span > 0)
+        err = np.hypot(x[start] + frac * (x[end] - x[start]) - x[active], y[start] + frac * (y[end] - y[start]) - y[active])
+
+        runs = np.flatnonzero(np.r_[True, seg[1:] != seg[:-1]])
+        run_max = np.maximum.reduceat(err, runs)
+        bad = run_max > tolerance
+        if not bad.any():
+            break
+
+        run_of = np.repeat(np.arange(len(runs)), np.diff(np.r_[runs, len(active)]))
+        worst = np.flatnonzero(bad[run_of] & (err == run_max[run_of]))
+        first = worst[np.r_[True, run_of[worst][1:] != run_of[worst][:-1]]]
+        keep[active[first]] = True
+
+        unresolved = bad[run_of]
+        unresolved[first] = False
+        active = active[unresolved]
+
+    return np.flatnonzero(keep)
+
+
+class AdaptiveFrames:
+    def __init__(self, frame_interval, count, driver_numbers, driver_info, knots, laps):
+        self.frame_interval = frame_interval
+        self.count = count
+        self.driver_numbers = list(driver_numbers)
+        self.driver_info = driver_info
+
+        # Laps only change a few dozen times per session, so keep just the change points
+        laps = np.asarray(laps)
+        changes = np.r_[0, np.flatnonzero(np.diff(laps)) + 1] if len(laps) else np.empty(0, dtype=int)
+        self.lap_change_idx = changes.astype(np.int32)
+        self.lap_values = laps[changes].astype(np.int16)
+
+        # Every driver's knots live in one array, each driver shifted past the previous one in time,
+        # so a single searchsorted call finds the surrounding knots for all drivers at once
+        self.shift = max((k[0][-1] for k in knots.values() if len(k[0])), default=0.0) + 1.0
+        shifted, xs, ys, lengths = [], [], [], []
+        for i, driver_number in enumerate(self.driver_numbers):
+            kt, kx, ky, _ = knots[driver_number]
+            shifted.append(kt + i * self.shift)
+            xs.append(kx)
+            ys.append(ky)
+            lengths.append(len(kt))
+
+        self.knot_t = np.concatenate(shifted) if shifted else np.empty(0)
+        self.knot_x = np.concatenate(xs).astype(np.float32) if xs else np.empty(0, dtype=np.float32)
+        self.knot_y = np.concatenate(ys).astype(np.float32) if ys else np.empty(0, dtype=np.float32)
+        ends = np.cumsum(lengths)
+        self.first_knot = (ends - np.asarray(lengths)).astype(np.int64)
+        self.last_knot = (ends - 1).astype(np.int64)
+        self.end_times = np.array([knots[d][3] for d in self.driver_numbers], dtype=float)
+        self.offsets = np.arange(len(self.driver_numbers)) * self.shift
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    @property
+    def times(self):
+        return np.arange(self.count) * self.frame_interval
+
+    @property
+    def duration(self):
+        return (self.count - 1) * self.frame_interval if self.count else 0.0
+
+    def trajectory(self, driver_number):
+        if driver_number not in self.driver_numbers:
+            return np.empty(0), np.empty(0), np.empty(0)
+        i = self.driver_numbers.index(driver_number)
+        knots = slice(self.first_knot[i], self.last_knot[i] + 1)
+        return self.knot_t[knots] - self.offsets[i], self.knot_x[knots].astype(float), self.knot_y[knots].astype(float)
+
+    def positions_at(self, time):
+        query = time + self.offsets
+        upper = np.clip(np.searchsorted(self.knot_t, query, side="right"), self.first_knot + 1, self.last_knot)
+        lower = np.maximum(upper - 1, self.first_knot)
+
+        t0, t1 = self.knot_t[lower], self.knot_t[upper]
+        span = t1 - t0
+        frac = np.clip(np.divide(query - t0, span, out=np.zeros(len(query)), where=span > 0), 0.0, 1.0)
+        x = self.knot_x[lower] + frac * (self.knot_x[upper] - self.knot_x[lower])
+        y = self.knot_y[lower] + frac * (self.knot_y[upper] - self.knot_y[lower])
+        return x, y, time <= self.end_times
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("frame index out of range")
+
+        time = idx * self.frame_interval
+        lap = int(self.lap_values[np.searchsorted(self.lap_change_idx, idx, side="right") - 1])
+        xs, ys, active = self.positions_at(time)
+        xs, ys, active = xs.tolist(), ys.tolist(), active.tolist()
+
+        drivers = {}
+        for i, driver_number in enumerate(self.driver_numbers):
+            info = self.driver_info[driver_number]
+            drivers[driver_number] = {
+                "x": xs[i],
+                "y": ys[i],
+                "lap": lap,
+                "abbreviation": info["abbreviation"],
+                "colour": info["colour"],
+                "active": active[i],
+            }
+
+        return {"time": time, "drivers": drivers}
+
+    @property
+    def nbytes(self):
+        arrays = (
+            self.knot_t, self.knot_x, self.knot_y, self.first_knot, self.last_knot,
+            self.end_times, self.offsets, self.lap_change_idx, self.lap_values,
+        )
+        return sum(a.nbytes for a in arrays)
+
+
+def build_adaptive_frames(driver_data, frame_interval, count, laps, tolerance):
+    driver_numbers = [d for d in driver_data if len(driver_data[d]["timestamps"])]
+    knots = {}
+
+    for driver_number in driver_numbers:
+        data = driver_data[driver_number]
+        ts = np.asarray(data["timestamps"], dtype=float)
+        xs = np.asarray(data["x"], dtype=float)
+        ys = np.asarray(data["y"], dtype=float)
+
+        kept = simplify_trajectory(ts, xs, ys, tolerance)
+        knots[driver_number] = (ts[kept], xs[kept], ys[kept], float(ts[-1]))
+
+    driver_info = {
+        d: {"abbreviation": driver_data[d]["abbreviation"], "colour": driver_data[d]["colour"]}
+        for d in driver_numbers
+    }
+    return AdaptiveFrames(frame_interval, count, driver_numbers, driver_info, knots, laps)
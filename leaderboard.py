@@ -51,14 +51,63 @@ def get_compound_icon(compound_type):
     
     return None
 
-def draw_leaderboard(screen, race, header_view_mode, frame):
-    panel_colour = (25, 25, 25)
-    panel_rect = pygame.Rect(20, 20, 230, 750) 
+LEADERBOARD_AREA = pygame.Rect(20, 20, 260, 750)
+LEADERBOARD_PANEL = pygame.Rect(20, 20, 230, 750)
+HEADER_HEIGHT = 40
+ROW_HEIGHT = 30
 
-    pygame.draw.rect(screen, panel_colour, panel_rect, border_radius=5)
-    pygame.draw.rect(screen, (180, 180, 180), panel_rect, 2, border_radius=5)
+fonts = {}
 
-    
+def get_font(size, bold=True):
+    # SysFont looks the font up on disk, so each size is created once and reused every frame
+    key = (size, bold)
+    if key not in fonts:
+        fonts[key] = pygame.font.SysFont("Arial", size, bold=bold)
+    return fonts[key]
+
+def header_texts(race, header_view_mode, frame):
+    total_laps = race.session.total_laps if hasattr(race.session, "total_laps") else "?"
+
+    current_lap = 1
+    for d in frame["drivers"].values():
+        if d["active"]:
+            current_lap = max(current_lap, d["lap"])
+    if current_lap == 0: current_lap = 1
+
+    if header_view_mode == 0: 
+        return "LAP", f"{current_lap}", f"/ {total_laps}"
+
+    hours = int(frame["time"] // 3600)
+    minutes = int((frame["time"] % 3600) // 60)
+    seconds = int(frame["time"] % 60)
+    return "", f"{hours:02d}:{minutes:02d}:{seconds:02d}", ""
+
+def header_rect():
+    logo_h = 80 if get_logo() else 0
+    return pygame.Rect(LEADERBOARD_PANEL.x, LEADERBOARD_PANEL.y + logo_h, LEADERBOARD_PANEL.width, HEADER_HEIGHT)
+
+def toggle_rect():
+    header = header_rect()
+    arrow_x = LEADERBOARD_PANEL.right - 20
+    return pygame.Rect(arrow_x - 15, header.centery - 15, 30, 30)
+
+def row_rect(index):
+    # Rows include the pit marker drawn just outside the panel
+    top = header_rect().bottom + 10 + index * ROW_HEIGHT
+    return pygame.Rect(LEADERBOARD_PANEL.x, top, LEADERBOARD_AREA.width - 2, ROW_HEIGHT)
+
+def row_gap_text(entry, show_stints):
+    if show_stints and entry.get("Stint") is not None:
+        return f"S{entry['Stint']} {entry['TyreAge']}L"
+    return f"{entry['Gap']}"
+
+def row_signature(entry, show_stints):
+    return (entry["Position"], entry["Abbreviation"], entry["DNF"], entry["Pitting"], entry.get("Compound"), row_gap_text(entry, show_stints))
+
+def draw_leaderboard_panel(screen):
+    panel_rect = LEADERBOARD_PANEL
+    pygame.draw.rect(screen, (25, 25, 25), panel_rect, border_radius=5)
+    pygame.draw.rect(screen, (180, 180, 180), panel_rect, 2, border_radius=5)
 
     logo = get_logo()
     logo_h = 0
@@ -72,95 +121,105 @@ def draw_leaderboard(screen, race, header_view_mode, frame):
 
     pygame.draw.line(screen, (100, 100, 100), (panel_rect.x + 2, logo_h + 17), (panel_rect.right - 2, logo_h + 17), 1)
 
-    header_height = 40
-    header_start_y = panel_rect.y + logo_h 
-    
-    line_y = header_start_y + header_height
+    line_y = header_rect().bottom
     pygame.draw.line(screen, (100, 100, 100), (panel_rect.x + 2, line_y), (panel_rect.right - 2, line_y), 1)
 
-    total_laps = race.session.total_laps if hasattr(race.session, "total_laps") else "?"
-    leaderboard = race.get_leaderboard(frame["time"])
-    
-    current_lap = 1
-    for d in frame["drivers"].values():
-        if d["active"]:
-            current_lap = max(current_lap, d["lap"])
-    if current_lap == 0: current_lap = 1
+def draw_leaderboard_header(screen, race, header_view_mode, frame):
+    label_text, main_text, sub_text = header_texts(race, header_view_mode, frame)
 
+    s_label = get_font(14).render(label_text, True, (150, 150, 150))
+    s_main = get_font(18).render(main_text, True, (255, 255, 255))
+    s_sub = get_font(16).render(sub_text, True, (150, 150, 150))
 
-    if header_view_mode == 0: 
-        label_text = "LAP"
-        main_text = f"{current_lap}"
-        sub_text = f"/ {total_laps}"
-    else: 
-        label_text = ""
-        hours = int(frame["time"] // 3600)
-        minutes = int((frame["time"] % 3600) // 60)
-        seconds = int(frame["time"] % 60)
-        main_text = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-        sub_text = ""
-
-    head_lbl_font = pygame.font.SysFont("Arial", 14, bold=True)
-    head_val_font = pygame.font.SysFont("Arial", 18, bold=True)
-    head_sub_font = pygame.font.SysFont("Arial", 16, bold=True)
-
-    s_label = head_lbl_font.render(label_text, True, (150, 150, 150))
-    s_main = head_val_font.render(main_text, True, (255, 255, 255))
-    s_sub = head_sub_font.render(sub_text, True, (150, 150, 150))
-
-    center_y = header_start_y + (header_height // 2)
+    header = header_rect()
+    center_y = header.centery
 
     gap = 8
     total_w = s_label.get_width() + gap + s_main.get_width() + gap + s_sub.get_width()
-    start_x = panel_rect.x + (panel_rect.width - total_w) // 2
+    start_x = header.x + (header.width - total_w) // 2
     
     screen.blit(s_label, (start_x, center_y - s_label.get_height()//2))
     screen.blit(s_main, (start_x + s_label.get_width() + gap, center_y - s_main.get_height()//2))
     screen.blit(s_sub, (start_x + s_label.get_width() + gap + s_main.get_width() + gap, center_y - s_sub.get_height()//2 + 2))
 
-    arrow_x = panel_rect.right - 20
+    arrow_x = LEADERBOARD_PANEL.right - 20
     arrow_pts = [(arrow_x-5, center_y-5), (arrow_x-5, center_y+5), (arrow_x+5, center_y)]
     pygame.draw.polygon(screen, (200, 200, 200), arrow_pts)
-    
-    toggle_btn_rect = pygame.Rect(arrow_x - 15, center_y - 15, 30, 30)
 
-    row_y = line_y + 10 
+def draw_leaderboard_row(screen, entry, index, show_stints=False):
+    panel_rect = LEADERBOARD_PANEL
+    row_y = row_rect(index).y
+    position_font = get_font(22, bold=False)
+
+    text_color = (150, 150, 150) if entry['DNF'] else (255, 255, 255)
     
-    name_font = pygame.font.SysFont("Arial", 24, bold=True)
-    position_font = pygame.font.SysFont("Arial", 22, bold=False)
-    pit_font = pygame.font.SysFont("Arial", 16, bold=True)
+    position_text = position_font.render(f"{entry['Position']:>2}", True, text_color)
+    screen.blit(position_text, (panel_rect.x + 10, row_y))
+
+    name_text = get_font(24).render(f"{entry['Abbreviation']}", True, text_color)
+    screen.blit(name_text, (panel_rect.x + 50, row_y)) 
+
+    if entry["Pitting"]:
+        pit_box_rect = pygame.Rect(panel_rect.right + 2, row_y, 24, 24)
+        pygame.draw.rect(screen, (255, 255, 255), pit_box_rect)
+        p_text = get_font(16).render("P", True, (0, 0, 0))
+        p_rect = p_text.get_rect(center=pit_box_rect.center)
+        screen.blit(p_text, p_rect)
+
+    if entry["DNF"]:
+        dnf_text = position_font.render("DNF", True, text_color)
+        screen.blit(dnf_text, (panel_rect.right - 60, row_y))
+    else:
+        gap = position_font.render(row_gap_text(entry, show_stints), True, (200,200,200))
+        screen.blit(gap, (panel_rect.x + 120, row_y))
+        compound_name = entry.get("Compound", "UNKNOWN")
+        compound_icon = get_compound_icon(compound_name)
+        if compound_icon:
+            icon_x = panel_rect.right - 40
+            icon_y = row_y + (name_text.get_height() // 2) - (compound_icon.get_height() // 2)
+            screen.blit(compound_icon, (icon_x, icon_y))
+
+def draw_leaderboard(screen, race, header_view_mode, frame, leaderboard=None, show_stints=False):
+    if leaderboard is None:
+        leaderboard = race.get_leaderboard(frame["time"])
+
+    draw_leaderboard_panel(screen)
+    draw_leaderboard_header(screen, race, header_view_mode, frame)
+    for index, entry in enumerate(leaderboard):
+        draw_leaderboard_row(screen, entry, index, show_stints)
+
+    return toggle_rect()
+
+
+COMPACT_LEADERBOARD_WIDTH = 150
+
+def draw_compact_leaderboard(screen, race, frame, rect, leaderboard=None):
+    # A narrow timing tower for split-screen panes, with rows shrunk to fit the available height
+    pygame.draw.rect(screen, (25, 25, 25), rect, border_radius=5)
+    pygame.draw.rect(screen, (180, 180, 180), rect, 2, border_radius=5)
+
+    if leaderboard is None:
+        leaderboard = race.get_leaderboard(frame["time"])
+    if not leaderboard:
+        return
+
+    row_h = max(10, min(24, (rect.height - 10) // len(leaderboard)))
+    font = get_font(row_h - 4)
+    row_y = rect.y + 5
 
     for entry in leaderboard:
-        text_color = (150, 150, 150) if entry['DNF'] else (255, 255, 255)
-        
-        position_text = position_font.render(f"{entry['Position']:>2}", True, text_color)
-        screen.blit(position_text, (panel_rect.x + 10, row_y))
-
-        name_text = name_font.render(f"{entry['Abbreviation']}", True, text_color)
-        screen.blit(name_text, (panel_rect.x + 50, row_y)) 
-
-        if entry["Pitting"]:
-            pit_box_rect = pygame.Rect(panel_rect.right + 2, row_y, 24, 24)
-            pygame.draw.rect(screen, (255, 255, 255), pit_box_rect)
-            p_text = pit_font.render("P", True, (0, 0, 0))
-            p_rect = p_text.get_rect(center=pit_box_rect.center)
-            screen.blit(p_text, p_rect)
+        if row_y + row_h > rect.bottom:
+            break
+        text_color = (150, 150, 150) if entry["DNF"] else (255, 255, 255)
+        screen.blit(font.render(f"{entry['Position']:>2}", True, text_color), (rect.x + 6, row_y))
+        screen.blit(font.render(entry["Abbreviation"], True, text_color), (rect.x + 32, row_y))
 
         if entry["DNF"]:
-            dnf_text = position_font.render("DNF", True, text_color)
-            screen.blit(dnf_text, (panel_rect.right - 60, row_y))
+            status, status_color = "DNF", text_color
+        elif entry["Pitting"]:
+            status, status_color = "PIT", (255, 200, 60)
         else:
-            gap = position_font.render(f"{entry['Gap']}", True, (200,200,200))
-            screen.blit(gap, (panel_rect.x + 120, row_y))
-            compound_name = entry.get("Compound", "UNKNOWN")
-            compound_icon = get_compound_icon(compound_name)
-            if compound_icon:
-                icon_x = panel_rect.right - 40
-                icon_y = row_y + (name_text.get_height() // 2) - (compound_icon.get_height() // 2)
-                screen.blit(compound_icon, (icon_x, icon_y))
-        
-        row_y += 30
-
-    return toggle_btn_rect
-    
-    
\ No newline at end of file
+            status, status_color = f"{entry['Gap']}", (200, 200, 200)
+        status_text = font.render(status, True, status_color)
+        screen.blit(status_text, (rect.right - 6 - status_text.get_width(), row_y))
+        row_y += row_h
@@ -1,40 +1,53 @@
+from startup import BackgroundImporter, PROCESS_START, loaded_heavy_modules
+from functools import partial
+import os
+import time
 import pygame
-from race_data import RaceData
-from leaderboard import draw_leaderboard
-from menu import Menu 
 
-WIDTH, HEIGHT = 1600, 900
+# pygame.surfarray already pulls in numpy, so only modules loaded after this point count against startup
+PRELOADED_MODULES = set(loaded_heavy_modules())
 
-def world_to_screen(race, x, y):
-    min_x, max_x = race.track_x.min(), race.track_x.max()
-    min_y, max_y = race.track_y.min(), race.track_y.max()
-    
-    track_w = max_x - min_x
-    track_h = max_y - min_y
-    
-    scale = min(WIDTH / track_w, HEIGHT / track_h) * 0.7
-    x_offset = (WIDTH - track_w * scale) / 2 + 100
-    y_offset = (HEIGHT - track_h * scale) / 2
-    
-    screen_x = (x - min_x) * scale + x_offset
-    screen_y = HEIGHT - ((y - min_y) * scale + y_offset)
-    
-    return int(screen_x), int(screen_y)
+from leaderboard import (
+    draw_leaderboard_header, draw_leaderboard_panel, draw_leaderboard_row, header_rect, row_rect, row_signature,
+    header_texts, toggle_rect, LEADERBOARD_PANEL,
+)
+from menu import Menu 
+from catalogue import SessionCatalogue
+from render import DirtyRegions, SceneItem, draw_scene
+from drawing import WIDTH, HEIGHT, draw_car, draw_loading
+
+ZOOM_STEP = 1.25
+DIRTY_RECTS = True
+TELEMETRY_RECT = pygame.Rect(WIDTH - 640, HEIGHT - 300, 620, 280)
+DELTA_RECT = pygame.Rect(300, HEIGHT - 150, 600, 130)
+STARTUP_BENCH = os.environ.get("F1_STARTUP_BENCH") == "1"
+STARTUP_BENCH_FRAMES = 30
 
-def draw_loading(screen, text):
-    screen.fill((20, 20, 20))
-    font = pygame.font.Font(None, 48)
-    surf = font.render(text, True, (255, 255, 255))
-    rect = surf.get_rect(center=(WIDTH//2, HEIGHT//2))
-    screen.blit(surf, rect)
-    pygame.display.flip()
+def text_item(key, text, surface, rect):
+    return SceneItem(key, rect, text, lambda screen: screen.blit(surface, rect))
 
 def main():
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("F1 Race Replay - Configuration")
     
-    menu = Menu(screen)
+    # pandas and fastf1 import while the user fills in the menu; the menu starts the thread after its first frame
+    importer = BackgroundImporter()
+    report_first_frame = None
+    if STARTUP_BENCH:
+        def report_first_frame():
+            elapsed = time.perf_counter() - PROCESS_START
+            print(f"FIRST_MENU_FRAME {elapsed:.4f} {','.join(loaded_heavy_modules(preloaded=PRELOADED_MODULES))}", flush=True)
+
+    menu = Menu(screen, SessionCatalogue().build(), importer, report_first_frame)
+
+    if STARTUP_BENCH:
+        # Keep drawing while the imports run, as a real launch would, then let them finish
+        menu.run(max_frames=STARTUP_BENCH_FRAMES)
+        importer.wait()
+        pygame.quit()
+        return
+
     user_settings = menu.run()
 
     if user_settings is None:
@@ -46,6 +59,13 @@ def main():
     draw_loading(screen, f"Loading {gp_location} {gp_year}...")
     
     try:
+        importer.wait()
+        import numpy as np
+        from race_data import RaceData
+        from camera import Camera
+        from telemetry import draw_telemetry_panel, lap_window
+        from comparison import LapCache, LapComparison, draw_compare_message, draw_delta_trace, draw_ghost
+
         race = RaceData(gp_year, gp_location, session_type)
     except Exception as e:
         print(f"Error loading session: {e}")
@@ -55,11 +75,8 @@ def main():
     pygame.display.set_caption(f"F1 Race Replay: {gp_location} {gp_year}")
     clock = pygame.time.Clock()
 
-    track_points = []
-    if race.track_x is not None:
-        for i in range(len(race.track_x)):
-            sx, sy = world_to_screen(race, race.track_x[i], race.track_y[i])
-            track_points.append((sx, sy))
+    camera = Camera(race.track_x, race.track_y, WIDTH, HEIGHT)
+    follow_order = list(race.driver_data.keys())
 
     playback_speed = 1.0
     current_frame = 0.0
@@ -71,17 +88,46 @@ def main():
     driver_font = pygame.font.Font(None, 28)
     
     header_view_mode = 0
-    toggle_btn_rect = pygame.Rect(0, 0, 0, 0)
+    toggle_btn_rect = toggle_rect()
     last_toggle_time = 0
 
+    dirty_rects = DIRTY_RECTS
+    dirty = DirtyRegions(screen.get_rect())
+    last_camera_state = None
+    leaderboard = None
+    leaderboard_frame = None
+    name_surfaces = {}
+
+    show_telemetry = False
+    telemetry_lap_mode = False
+    telemetry_window = 60.0
+    race_duration = race.frames[-1]["time"] if race.frames else 0.0
+
+    lap_cache = LapCache(race)
+    compare_mode = False
+    compare_slots = None
+    active_slot = 0
+    compare_elapsed = 0.0
+    comparison = None
+
+    show_sectors = False
+    sector_lap = None
+    show_stints = False
+
+    def draw_background(surface):
+        surface.fill((20, 20, 20))
+        camera.draw_track(surface)
+
     print(f"\nStarting replay with {len(race.frames)} frames...")
     
     while running:
         dt_ms = clock.tick(60)
         dt = dt_ms / 1000.0
         current_ticks = pygame.time.get_ticks()
+        had_input = False
 
         for event in pygame.event.get():
+            had_input = True
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.KEYDOWN:
@@ -97,6 +143,71 @@ def main():
                     playback_speed = min(64.0, playback_speed * 2)
                 elif event.key == pygame.K_DOWN:
                     playback_speed = max(0.25, playback_speed / 2)
+                elif event.key == pygame.K_f and follow_order:
+                    if camera.follow_driver in follow_order:
+                        next_idx = follow_order.index(camera.follow_driver) + 1
+                        camera.follow_driver = follow_order[next_idx] if next_idx < len(follow_order) else None
+                    else:
+                        camera.follow_driver = follow_order[0]
+                elif event.key == pygame.K_r:
+                    camera.reset()
+                elif event.key == pygame.K_d:
+                    dirty_rects = not dirty_rects
+                    dirty.invalidate()
+                elif event.key == pygame.K_t:
+                    show_telemetry = not show_telemetry
+                elif event.key == pygame.K_l:
+                    telemetry_lap_mode = not telemetry_lap_mode
+                elif event.key == pygame.K_LEFTBRACKET:
+                    telemetry_window = max(5.0, telemetry_window / 2)
+                elif event.key == pygame.K_RIGHTBRACKET:
+                    telemetry_window = min(max(race_duration, 5.0), telemetry_window * 2)
+                elif event.key == pygame.K_c:
+                    compare_mode = not compare_mode
+                    if compare_mode and compare_slots is None and leaderboard:
+                        first = camera.follow_driver or leaderboard[0]["driver_number"]
+                        others = [e["driver_number"] for e in leaderboard if e["driver_number"] != first]
+                        lap = max(1, leaderboard[0]["lap"] - 1)
+                        second = others[0] if others else first
+                        compare_slots = [[d, min(lap, lap_cache.last_lap(d))] for d in (first, second)]
+                    comparison = None
+                    compare_elapsed = 0.0
+                elif compare_mode and compare_slots and event.key == pygame.K_TAB:
+                    active_slot = 1 - active_slot
+                elif compare_mode and compare_slots and event.key in (pygame.K_q, pygame.K_e) and follow_order:
+                    slot = compare_slots[active_slot]
+                    step = 1 if event.key == pygame.K_e else -1
+                    idx = follow_order.index(slot[0]) if slot[0] in follow_order else 0
+                    slot[0] = follow_order[(idx + step) % len(follow_order)]
+                    slot[1] = min(slot[1], lap_cache.last_lap(slot[0]))
+                    comparison = None
+                elif compare_mode and compare_slots and event.key in (pygame.K_z, pygame.K_x):
+                    slot = compare_slots[active_slot]
+                    step = 1 if event.key == pygame.K_x else -1
+                    slot[1] = min(max(1, slot[1] + step), lap_cache.last_lap(slot[0]))
+                    comparison = None
+                elif event.key == pygame.K_i:
+                    show_stints = not show_stints
+                elif event.key == pygame.K_m:
+                    show_sectors = not show_sectors
+                elif show_sectors and event.key in (pygame.K_COMMA, pygame.K_PERIOD):
+                    # None shows the best time of every lap, then each timed lap in order
+                    options = [None] + race.get_mini_sectors().laps.tolist()
+                    idx = options.index(sector_lap) if sector_lap in options else 0
+                    step = 1 if event.key == pygame.K_PERIOD else -1
+                    sector_lap = options[(idx + step) % len(options)]
+                elif event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                    camera.zoom_at(ZOOM_STEP)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    camera.zoom_at(1 / ZOOM_STEP)
+
+            if event.type == pygame.WINDOWEXPOSED:
+                dirty.invalidate()
+            elif event.type == pygame.MOUSEWHEEL:
+                camera.zoom_at(ZOOM_STEP ** event.y, pygame.mouse.get_pos())
+            elif event.type == pygame.MOUSEMOTION:
+                if event.buttons[1] or event.buttons[2]:
+                    camera.pan(*event.rel)
             
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
@@ -113,36 +224,162 @@ def main():
                 current_frame = len(race.frames) - 1
                 paused = True
 
-        screen.fill((20, 20, 20))
-        
+            if comparison is not None:
+                compare_elapsed = (compare_elapsed + simulated_dt) % comparison.duration
+
+        compare_error = None
+        if compare_mode and compare_slots and comparison is None:
+            lap_a = lap_cache.get(*compare_slots[0])
+            lap_b = lap_cache.get(*compare_slots[1])
+            if lap_a is not None and lap_b is not None:
+                comparison = LapComparison(lap_a, lap_b)
+                compare_elapsed = min(compare_elapsed, comparison.duration)
+            else:
+                driver, lap = compare_slots[0] if lap_a is None else compare_slots[1]
+                abbreviation = race.driver_data[driver]["abbreviation"] if driver in race.driver_data else driver
+                compare_error = f"no data for {abbreviation} L{lap}"
+
         frame_idx = int(current_frame)
         frame = race.frames[frame_idx]
-        
-        if len(track_points) > 2:
-            pygame.draw.aalines(screen, (80, 80, 80), True, track_points, 3)
-            
-        for driver_num, driver in frame['drivers'].items():
-            sx, sy = world_to_screen(race, driver['x'], driver['y'])
+
+        if show_sectors:
+            mini_sectors = race.get_mini_sectors()
+            sector_drivers = [d for d, _ in compare_slots] if compare_mode and compare_slots else None
+            winners = mini_sectors.dominance(sector_lap, sector_drivers)
+            # Sectors nobody completed are -1, which picks the trailing grey entry
+            palette = [race.driver_data[d]["colour"] for d in mini_sectors.drivers] + [(80, 80, 80)]
+            camera.set_track_style(winners[mini_sectors.track_point_sectors], palette)
+        else:
+            camera.set_track_style(None)
+
+        camera.update_follow(frame)
+        camera_state = (camera.zoom, camera.centre_x, camera.centre_y, camera.style_version)
+        if camera_state != last_camera_state:
+            dirty.invalidate()
+            last_camera_state = camera_state
+
+        if dirty_rects and paused and not had_input and not dirty.full:
+            continue
+
+        if frame_idx != leaderboard_frame:
+            leaderboard = race.get_leaderboard(frame["time"])
+            leaderboard_frame = frame_idx
+
+        items = []
+
+        frame_drivers = list(frame['drivers'].items())
+        car_x = np.array([d['x'] for _, d in frame_drivers], dtype=float)
+        car_y = np.array([d['y'] for _, d in frame_drivers], dtype=float)
+        visible = np.flatnonzero(camera.visible_mask(car_x, car_y))
+        screen_x, screen_y = camera.world_to_screen(car_x[visible], car_y[visible])
+
+        for i, sx, sy in zip(visible, screen_x.astype(int).tolist(), screen_y.astype(int).tolist()):
+            driver_num, driver = frame_drivers[i]
             color = driver['colour'] if driver['active'] else (100, 100, 100)
-            
-            pygame.draw.circle(screen, color, (sx, sy), 8)
-            pygame.draw.circle(screen, (255, 255, 255), (sx, sy), 8, 2)
-            
-            name_text = driver_font.render(driver['abbreviation'], True, (255, 255, 255))
+
+            name_text = name_surfaces.get(driver['abbreviation'])
+            if name_text is None:
+                name_text = driver_font.render(driver['abbreviation'], True, (255, 255, 255))
+                name_surfaces[driver['abbreviation']] = name_text
             name_rect = name_text.get_rect(center=(sx, sy - 20))
-            screen.blit(name_text, name_rect)
+            car_rect = pygame.Rect(sx - 9, sy - 9, 19, 19).union(name_rect)
+
+            draw = partial(draw_car, color=color, pos=(sx, sy), name_text=name_text, name_rect=name_rect)
+            items.append(SceneItem(("car", driver_num), car_rect, color, draw))
+
+        if compare_mode and comparison is not None:
+            labels = [
+                f"{race.driver_data[d]['abbreviation'] if d in race.driver_data else d} L{lap}"
+                for d, lap in compare_slots
+            ]
+            colours = [
+                race.driver_data[d]["colour"] if d in race.driver_data else (255, 255, 255)
+                for d, _ in compare_slots
+            ]
+            if colours[0] == colours[1]:
+                colours[1] = (255, 255, 255)
+
+            # One item per ghost, so two cars far apart on track don't damage everything between them
+            for slot, ((x, y, _), colour, label) in enumerate(zip(comparison.positions(compare_elapsed), colours, labels)):
+                gx, gy = camera.world_to_screen(x, y)
+                pos = (int(gx), int(gy))
+
+                def draw_compare_ghost(surface, pos=pos, colour=colour, label=label):
+                    draw_ghost(surface, pos, colour, label, driver_font)
+
+                ghost_rect = pygame.Rect(pos[0] - 40, pos[1] - 12, 80, 46)
+                items.append(SceneItem(("ghost", slot), ghost_rect, (pos, label, colour), draw_compare_ghost))
+
+            delta_title = f"{labels[0]} vs {labels[1]}  [{'AB'[active_slot]}]"
+
+            def draw_delta(surface, elapsed=compare_elapsed, title=delta_title):
+                draw_delta_trace(surface, DELTA_RECT, comparison, elapsed, font, title)
+
+            items.append(SceneItem("delta", DELTA_RECT, (delta_title, compare_elapsed), draw_delta))
+        elif compare_error is not None:
+            draw_error = partial(draw_compare_message, rect=DELTA_RECT, font=font, text=compare_error)
+            items.append(SceneItem("delta", DELTA_RECT, compare_error, draw_error))
+
+        # The panel never changes, so only the header and the rows that moved or changed get redrawn
+        items.append(SceneItem("leaderboard", LEADERBOARD_PANEL, None, draw_leaderboard_panel))
+
+        header_signature = header_texts(race, header_view_mode, frame)
+        draw_header = partial(draw_leaderboard_header, race=race, header_view_mode=header_view_mode, frame=frame)
+        items.append(SceneItem("leaderboard header", header_rect(), header_signature, draw_header))
+
+        for index, entry in enumerate(leaderboard):
+            draw_row = partial(draw_leaderboard_row, entry=entry, index=index, show_stints=show_stints)
+            items.append(SceneItem(("row", entry["driver_number"]), row_rect(index), row_signature(entry, show_stints), draw_row))
+
+        telemetry_driver = camera.follow_driver
+        if telemetry_driver is None and leaderboard:
+            telemetry_driver = leaderboard[0]["driver_number"]
+
+        if show_telemetry and telemetry_driver in race.telemetry_pyramids:
+            now = frame["time"]
+            window = None
+            if telemetry_lap_mode:
+                window = lap_window(race.driver_lap_bounds.get(telemetry_driver, []), now)
+            if window is None:
+                window = (now - telemetry_window, now)
+
+            title = f"{race.driver_data[telemetry_driver]['abbreviation']} telemetry"
+            if not telemetry_lap_mode:
+                title += f" (last {telemetry_window:g}s)"
+
+            def draw_panel(surface, pyramids=race.telemetry_pyramids[telemetry_driver], window=window, now=now, title=title):
+                draw_telemetry_panel(surface, TELEMETRY_RECT, pyramids, window[0], window[1], now, font, title)
+
+            items.append(SceneItem("telemetry", TELEMETRY_RECT, (title, window, now), draw_panel))
+
+        speed_label = f"Speed: {playback_speed}x"
+        speed_text = font.render(speed_label, True, (255, 255, 255))
+        items.append(text_item("speed", speed_label, speed_text, speed_text.get_rect(topleft=(20, 800))))
+
+        camera_label = f"Zoom: {camera.zoom:.2f}x"
+        if camera.follow_driver is not None:
+            camera_label += f"  Following: {race.driver_data[camera.follow_driver]['abbreviation']}"
+        camera_text = font.render(camera_label, True, (255, 255, 255))
+        items.append(text_item("camera", camera_label, camera_text, camera_text.get_rect(topleft=(20, 825))))
+
+        if show_sectors:
+            sector_label = f"Mini-sectors: {'best of all laps' if sector_lap is None else f'lap {sector_lap}'}"
+            sector_text = font.render(sector_label, True, (255, 255, 255))
+            items.append(text_item("sectors", sector_label, sector_text, sector_text.get_rect(topleft=(20, 850))))
 
-        toggle_btn_rect = draw_leaderboard(screen, race, header_view_mode, frame)
-        
-        speed_text = font.render(f"Speed: {playback_speed}x", True, (255, 255, 255))
-        screen.blit(speed_text, (20, 800))
-        
         if paused:
             pause_text = title_font.render("PAUSED", True, (255, 50, 50))
-            pause_rect = pause_text.get_rect(center=(WIDTH // 2, 50))
-            screen.blit(pause_text, pause_rect)
+            items.append(text_item("paused", "PAUSED", pause_text, pause_text.get_rect(center=(WIDTH // 2, 50))))
 
-        pygame.display.flip()
+        if dirty_rects:
+            regions = dirty.damaged(items)
+            if not regions:
+                continue
+            draw_scene(screen, draw_background, items, regions)
+            pygame.display.update(regions)
+        else:
+            draw_scene(screen, draw_background, items)
+            pygame.display.flip()
 
     pygame.quit()
     print("Replay finished!")
@@ -1,7 +1,7 @@
 import pygame
 
 class InputBox:
-    def __init__(self, x, y, w, h, text="", label = ""):
+    def __init__(self, x, y, w, h, text="", label = "", completer=None):
         self.rect = pygame.Rect(x, y, w, h)
         self.color_inactive = pygame.Color('lightskyblue3')
         self.color_active = pygame.Color('dodgerblue2')
@@ -11,6 +11,8 @@ class InputBox:
         self.font = pygame.font.Font(None, 32)
         self.txt_surface = self.font.render(text, True, self.color)
         self.active = False
+        self.completer = completer
+        self.suggestion = None
 
 
     def handle_event(self, event):
@@ -26,6 +28,9 @@ class InputBox:
             if self.active:
                 if event.key == pygame.K_RETURN:
                     self.active = False
+                elif event.key == pygame.K_TAB:
+                    if self.suggestion:
+                        self.text = self.suggestion
                 elif event.key == pygame.K_BACKSPACE:
                     self.text = self.text[:-1]
                 else:
@@ -33,17 +38,31 @@ class InputBox:
                 
                 self.txt_surface = self.font.render(self.text, True, self.color)
         
+    def update_suggestion(self):
+        self.suggestion = None
+        if self.completer and self.text:
+            suggestion = self.completer(self.text)
+            if suggestion and suggestion.lower() != self.text.lower():
+                self.suggestion = suggestion
+
     def draw(self, screen):
         if self.label:
             label_surf = self.font.render(self.label, True, (200, 200, 200))
             screen.blit(label_surf, (self.rect.x - 120, self.rect.y + 5))
         
+        if self.active and self.suggestion:
+            hint_surf = self.font.render(self.suggestion, True, (90, 90, 90))
+            screen.blit(hint_surf, (self.rect.x + 5, self.rect.y + 5))
+
         screen.blit(self.txt_surface, (self.rect.x + 5, self.rect.y + 5))
         pygame.draw.rect(screen, self.color, self.rect, 2)
     
 class Menu:
-    def __init__(self, screen):
+    def __init__(self, screen, catalogue=None, importer=None, on_first_frame=None):
         self.screen = screen
+        self.catalogue = catalogue
+        self.importer = importer
+        self.on_first_frame = on_first_frame
         self.width, self.height = screen.get_size()
         self.font = pygame.font.Font(None, 32)
 
@@ -56,11 +75,19 @@ class Menu:
             "session_type": InputBox(centre_x, centre_y + 100, 200, 32, "R", "Session: ")
         }
 
+        if catalogue is not None:
+            self.inputs["year"].completer = catalogue.complete_year
+            self.inputs["location"].completer = lambda text: catalogue.complete_location(text, self.inputs["year"].text)
+            self.inputs["session_type"].completer = lambda text: catalogue.complete_session(
+                text, self.inputs["location"].text, self.inputs["year"].text
+            )
+
         self.start_button = pygame.Rect(centre_x, centre_y + 160, 200, 50)
         self.error_message = ""
     
-    def run(self):
+    def run(self, max_frames=None):
         clock = pygame.time.Clock()
+        frames = 0
 
         while True:
             for event in pygame.event.get():
@@ -69,6 +96,9 @@ class Menu:
 
                 for box in self.inputs.values():
                     box.handle_event(event)
+                    if event.type == pygame.KEYDOWN and box.active:
+                        box.update_suggestion()
+                        self.error_message = ""
                 
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if self.start_button.collidepoint(event.pos):
@@ -77,7 +107,10 @@ class Menu:
                             year = int(self.inputs["year"].text)
                             session = self.inputs["session_type"].text
 
-                            return (loc, year, session)
+                            if self.catalogue is not None:
+                                self.error_message = self.catalogue.validate(loc, year, session) or ""
+                            if not self.error_message:
+                                return (loc, year, session)
                         except ValueError:
                             self.error_message = "Year must be a number!"
 
@@ -95,9 +128,30 @@ class Menu:
             self.screen.blit(btn_text, btn_rect)
 
             if self.error_message:
-                err = self.font.render(self.error_msg, True, (255, 100, 100))
+                err = self.font.render(self.error_message, True, (255, 100, 100))
                 self.screen.blit(err, (self.width//2 - 100, self.height//2 + 220))
+            elif self.catalogue is not None:
+                try:
+                    year = int(self.inputs["year"].text)
+                except ValueError:
+                    year = None
+                if year is not None and self.catalogue.is_cached(self.inputs["location"].text, year, self.inputs["session_type"].text):
+                    cached = self.font.render("Cached - loads offline", True, (120, 200, 120))
+                    self.screen.blit(cached, (self.width//2 - 100, self.height//2 + 220))
+
+            if self.importer is not None and not self.importer.ready:
+                status = pygame.font.Font(None, 24).render("Loading data libraries...", True, (150, 150, 150))
+                self.screen.blit(status, (20, self.height - 40))
 
             pygame.display.flip()
+            frames += 1
+            if frames == 1:
+                if self.on_first_frame is not None:
+                    self.on_first_frame()
+                # Start the data imports only once the menu is on screen, so they can't delay it
+                if self.importer is not None and not self.importer.started:
+                    self.importer.start()
+            if max_frames is not None and frames >= max_frames:
+                return None
             clock.tick(60)
 
@@ -0,0 +1,219 @@
+import argparse
+import numpy as np
+import pygame
+from camera import Camera
+from race_data import RaceData
+from drawing import WIDTH, HEIGHT, draw_car, draw_loading
+from leaderboard import draw_leaderboard, draw_compact_leaderboard, LEADERBOARD_AREA, COMPACT_LEADERBOARD_WIDTH
+from catalogue import SessionCatalogue
+
+MAX_SESSIONS = 4
+OFFSET_STEP = 1.0
+ZOOM_STEP = 1.25
+
+
+def parse_session_spec(text):
+    parts = text.split(":")
+    if len(parts) != 3:
+        raise argparse.ArgumentTypeError(f"expected LOCATION:YEAR:SESSION, got '{text}'")
+    try:
+        return parts[0], int(parts[1]), parts[2]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"year must be a number in '{text}'")
+
+
+def board_rect(rect):
+    # Panes shorter than the full leaderboard get the compact timing tower instead
+    if rect.height >= LEADERBOARD_AREA.bottom + 20:
+        return LEADERBOARD_AREA
+    return pygame.Rect(10, 10, COMPACT_LEADERBOARD_WIDTH, rect.height - 20)
+
+
+class SessionPane:
+    def __init__(self, race, rect, camera):
+        self.race = race
+        self.rect = rect
+        self.camera = camera
+        self.board = board_rect(rect)
+        self.offset = 0.0
+        self.label = f"{race.location} {race.year} {race.session_type}"
+
+        first_lap_start = race.lap_timeline[0][0] if race.lap_timeline else race.global_start
+        self.start_offset = float(first_lap_start - race.global_start)
+
+    @property
+    def duration(self):
+        return self.race.frames.duration
+
+    def frame_at(self, replay_time):
+        idx = int((replay_time + self.offset) / self.race.frame_interval)
+        return self.race.frames[min(max(idx, 0), len(self.race.frames) - 1)]
+
+    def draw(self, screen, replay_time, fonts, selected):
+        surface = screen.subsurface(self.rect)
+        surface.fill((20, 20, 20))
+        self.camera.draw_track(surface)
+
+        frame = self.frame_at(replay_time)
+        frame_drivers = list(frame["drivers"].values())
+        car_x = np.array([d["x"] for d in frame_drivers], dtype=float)
+        car_y = np.array([d["y"] for d in frame_drivers], dtype=float)
+        visible = np.flatnonzero(self.camera.visible_mask(car_x, car_y))
+        screen_x, screen_y = self.camera.world_to_screen(car_x[visible], car_y[visible])
+
+        for i, sx, sy in zip(visible, screen_x.astype(int).tolist(), screen_y.astype(int).tolist()):
+            driver = frame_drivers[i]
+            color = driver["colour"] if driver["active"] else (100, 100, 100)
+            name_text = fonts["driver"].render(driver["abbreviation"], True, (255, 255, 255))
+            draw_car(surface, color, (sx, sy), name_text, name_text.get_rect(center=(sx, sy - 20)))
+
+        if self.board is LEADERBOARD_AREA:
+            draw_leaderboard(surface, self.race, 0, frame)
+        else:
+            draw_compact_leaderboard(surface, self.race, frame, self.board)
+
+        title = self.label if self.offset == 0 else f"{self.label}  {self.offset:+.1f}s"
+        title_text = fonts["title"].render(title, True, (255, 255, 255))
+        surface.blit(title_text, (self.board.right + 10, 10))
+
+        border = (255, 200, 60) if selected else (60, 60, 60)
+        pygame.draw.rect(surface, border, surface.get_rect(), 2)
+
+
+def pane_rects(count):
+    if count <= 2:
+        width = WIDTH // count
+        return [pygame.Rect(i * width, 0, width, HEIGHT) for i in range(count)]
+
+    # Three or four sessions share a 2x2 grid, so every pane keeps a usable track view
+    width, height = WIDTH // 2, HEIGHT // 2
+    return [pygame.Rect((i % 2) * width, (i // 2) * height, width, height) for i in range(count)]
+
+
+def load_races(screen, specs):
+    races = []
+    for location, year, session_type in specs:
+        draw_loading(screen, f"Loading {location} {year} {session_type}...")
+        # Telemetry pyramids are only used by the single-session panel
+        race = RaceData(year, location, session_type, telemetry=False)
+        print(f"{location} {year} {session_type}: {race.frames.nbytes / 1e6:.1f} MB of frames")
+        races.append(race)
+    return races
+
+
+def run_multi(screen, races):
+    # Panes on the same circuit share one camera, so they share its track tiles and view too
+    cameras = {}
+    panes = []
+    for race, rect in zip(races, pane_rects(len(races))):
+        camera = cameras.get(race.track_key)
+        if camera is None:
+            camera = Camera(race.track_x, race.track_y, rect.width, rect.height, left_margin=board_rect(rect).right)
+            cameras[race.track_key] = camera
+        panes.append(SessionPane(race, rect, camera))
+
+    fonts = {
+        "hud": pygame.font.Font(None, 22),
+        "title": pygame.font.Font(None, 26),
+        "driver": pygame.font.Font(None, 24),
+    }
+    clock = pygame.time.Clock()
+    replay_time = 0.0
+    playback_speed = 1.0
+    paused = False
+    selected = 0
+    running = True
+
+    while running:
+        dt = clock.tick(60) / 1000.0
+        duration = max(p.duration - p.offset for p in panes)
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                step = OFFSET_STEP * (10 if event.mod & pygame.KMOD_SHIFT else 1)
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                elif event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key == pygame.K_LEFT:
+                    replay_time = max(0.0, replay_time - 1.0)
+                elif event.key == pygame.K_RIGHT:
+                    replay_time = min(duration, replay_time + 1.0)
+                elif event.key == pygame.K_UP:
+                    playback_speed = min(64.0, playback_speed * 2)
+                elif event.key == pygame.K_DOWN:
+                    playback_speed = max(0.25, playback_speed / 2)
+                elif pygame.K_1 <= event.key < pygame.K_1 + len(panes):
+                    selected = event.key - pygame.K_1
+                elif event.key == pygame.K_COMMA:
+                    panes[selected].offset -= step
+                elif event.key == pygame.K_PERIOD:
+                    panes[selected].offset += step
+                elif event.key == pygame.K_o:
+                    for pane in panes:
+                        pane.offset = 0.0
+                elif event.key == pygame.K_a:
+                    # Line every session up on the start of its first lap
+                    for pane in panes:
+                        pane.offset = pane.start_offset - panes[0].start_offset
+                elif event.key == pygame.K_r:
+                    for camera in cameras.values():
+                        camera.reset()
+            elif event.type == pygame.MOUSEWHEEL:
+                mx, my = pygame.mouse.get_pos()
+                for pane in panes:
+                    if pane.rect.collidepoint(mx, my):
+                        pane.camera.zoom_at(ZOOM_STEP ** event.y, (mx - pane.rect.x, my - pane.rect.y))
+            elif event.type == pygame.MOUSEMOTION and (event.buttons[1] or event.buttons[2]):
+                for pane in panes:
+                    if pane.rect.collidepoint(event.pos):
+                        pane.camera.pan(*event.rel)
+
+        if not paused:
+            replay_time += dt * playback_speed
+            if replay_time >= duration:
+                replay_time = duration
+                paused = True
+
+        for i, pane in enumerate(panes):
+            pane.draw(screen, replay_time, fonts, i == selected)
+
+        hud = f"Speed: {playback_speed}x   Session {selected + 1} selected   ,/. offset  A align  O sync"
+        screen.blit(fonts["hud"].render(hud, True, (255, 255, 255)), (panes[0].board.right + 10, HEIGHT - 30))
+
+        pygame.display.flip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay several sessions side by side")
+    parser.add_argument("sessions", nargs="+", type=parse_session_spec, help="LOCATION:YEAR:SESSION, e.g. Monza:2025:R")
+    args = parser.parse_args()
+
+    if len(args.sessions) > MAX_SESSIONS:
+        parser.error(f"at most {MAX_SESSIONS} sessions fit in one window")
+
+    catalogue = SessionCatalogue().build()
+    for location, year, session_type in args.sessions:
+        error = catalogue.validate(location, year, session_type)
+        if error:
+            parser.error(error)
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("F1 Race Replay - Multi-session")
+
+    try:
+        races = load_races(screen, args.sessions)
+    except Exception as e:
+        print(f"Error loading session: {e}")
+        pygame.quit()
+        return
+
+    run_multi(screen, races)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,43 @@
 import fastf1
 import numpy as np
 import pandas as pd
+from telemetry import ChannelPyramid, TELEMETRY_CHANNELS, lap_bounds
+from sectors import MiniSectors
+from catalogue import CACHE_DIR, update_catalogue
+from frames import build_adaptive_frames, build_compact_frames
+from analytics import stint_laps
+
+# "adaptive" keeps error-bounded variable-rate knots per driver, "compact" a fixed-rate grid.
+# Adaptive frames are several times smaller but simplifying a race-length trajectory adds
+# roughly 0.2s per driver to loading; either way the full-rate samples are released after load
+FRAME_MODE = "adaptive"
+# Maximum position error of adaptive frames, in world units (tenths of a metre)
+FRAME_TOLERANCE = 5.0
+
+# Track geometry keyed by circuit, shared by every RaceData in the process
+TRACK_CACHE = {}
 
 
 class RaceData:
-    def __init__(self, year, location, session_type):
+    def __init__(self, year, location, session_type, telemetry=True, frame_mode=FRAME_MODE):
         self.year = year
         self.location = location
         self.session_type = session_type
+        self.telemetry = telemetry
+        self.frame_mode = frame_mode
         self.session = None
         self.drivers = []
         self.driver_data = {}
         self.driver_compounds = {}
+        self.driver_stints = {}
         self.driver_status = {}
         self.pit_windows = {}
         self.track_x = None
         self.track_y = None
         self.track_length = None
         self.track_s = None
+        self.track_rotation = 0.0
+        self.track_key = None
         self.frames = []
         self.frame_interval = 0.1
         self.global_start = None
@@ -27,14 +47,23 @@ class RaceData:
         self.last_visual_time = -1.0
         self.lap_position_map = {}
         self.gap_timeline = {} 
+        self.telemetry_pyramids = {}
+        self.driver_lap_bounds = {}
+        self.mini_sectors = None
 
         self.load_session()
         self.load_results()
         self.build_compound_map()
+        self.build_stint_map()
         self.load_track()
         self.load_drivers()
         self.build_lap_timeline()
         self.align_timelines_and_generate_frames()
+        # Built here, behind the loading screen, so toggling the map never stalls the replay
+        self.get_mini_sectors()
+        if self.telemetry:
+            self.build_telemetry_pyramids()
+        self.release_raw_positions()
         self.build_lap_position_map()
         self.build_position_timeline()
         self.build_pit_windows()
@@ -43,11 +72,16 @@ class RaceData:
 
     def load_session(self):
         print(f"Loading {self.location} {self.year} {self.session_type}")
-        fastf1.Cache.enable_cache("cache")
+        fastf1.Cache.enable_cache(CACHE_DIR)
         self.session = fastf1.get_session(self.year, self.location, self.session_type)
         self.session.load(telemetry=True, weather=False, laps=True)
         print(f"Session loaded: {self.session.event['EventName']}")
 
+        try:
+            update_catalogue(self.year, fastf1.get_event_schedule(self.year, include_testing=False))
+        except Exception as e:
+            print(f"Catalogue update skipped: {e}")
+
     def load_results(self):
         if self.session and hasattr(self.session, "results"):
             for _, row in self.session.results.iterrows():
@@ -65,17 +99,32 @@ class RaceData:
         print("Driver status loaded.")
 
     def load_track(self):
-        fastest_lap = self.session.laps.pick_fastest()
-        telemetry = fastest_lap.get_telemetry()
         circuit_info = self.session.get_circuit_info()
         angle = np.radians(circuit_info.rotation)
         cos, sin = np.cos(angle), np.sin(angle)
+        self.track_rotation = angle
+
+        # The corner count tells apart layout changes at the same venue
+        self.track_key = (str(self.session.event["Location"]), len(circuit_info.corners))
+        if self.track_key in TRACK_CACHE:
+            self.track_x, self.track_y, self.track_s, self.track_length = TRACK_CACHE[self.track_key]
+            print(f"Track reused: {len(self.track_x)} points")
+            return
+
+        fastest_lap = self.session.laps.pick_fastest()
+        telemetry = fastest_lap.get_telemetry()
 
         raw_x = telemetry["X"].values
         raw_y = telemetry["Y"].values
         self.track_x = raw_x * cos - raw_y * sin
         self.track_y = raw_x * sin + raw_y * cos
 
+        # Arc length along the closed loop, including the closing segment back to the start
+        step = np.hypot(np.diff(self.track_x, append=self.track_x[0]), np.diff(self.track_y, append=self.track_y[0]))
+        self.track_s = np.concatenate(([0.0], np.cumsum(step[:-1])))
+        self.track_length = float(step.sum())
+        TRACK_CACHE[self.track_key] = (self.track_x, self.track_y, self.track_s, self.track_length)
+
         print(f"Track loaded: {len(self.track_x)} points")
 
     def load_drivers(self):
@@ -100,30 +149,44 @@ class RaceData:
                 if full_telemetry is None or full_telemetry.empty:
                     continue
                 
-                if "LapNumber" in full_telemetry.columns:
-                    lap_numbers = full_telemetry["LapNumber"].values
-                else:
-                    lap_numbers = np.ones(len(full_telemetry), dtype=int)
-                
                 if "SessionTime" in full_telemetry.columns:
                     timestamps = (full_telemetry["SessionTime"].dt.total_seconds().values)
                 else:
                     timestamps = full_telemetry["Time"].dt.total_seconds().values
 
+                if "LapNumber" in full_telemetry.columns:
+                    lap_numbers = full_telemetry["LapNumber"].values
+                else:
+                    # Merged lap telemetry has no LapNumber column, so look it up from the lap start times
+                    lap_rows = driver_laps.dropna(subset=["LapStartTime", "LapNumber"]).sort_values("LapStartTime")
+                    lap_starts = lap_rows["LapStartTime"].dt.total_seconds().to_numpy(dtype=float)
+                    lap_idx = np.clip(np.searchsorted(lap_starts, timestamps, side="right") - 1, 0, None)
+                    lap_numbers = lap_rows["LapNumber"].to_numpy(dtype=int)[lap_idx] if len(lap_rows) else np.ones(len(timestamps), dtype=int)
+
+                # Only the points where the lap number changes are kept, not one lap number per sample
+                lap_changes = np.r_[0, np.flatnonzero(np.diff(lap_numbers)) + 1]
+
                 raw_x = full_telemetry["X"].values
                 raw_y = full_telemetry["Y"].values
 
                 rotated_x = raw_x * cos - raw_y * sin
                 rotated_y = raw_x * sin + raw_y * cos
 
+                channels = {}
+                for channel in TELEMETRY_CHANNELS if self.telemetry else ():
+                    if channel in full_telemetry.columns:
+                        channels[channel] = full_telemetry[channel].to_numpy(dtype=float)
+
                 self.driver_data[driver_number] = {
                     "abbreviation": abbreviation,
                     "timestamps": timestamps,
                     "x": rotated_x,
                     "y": rotated_y,
-                    "lap_numbers": lap_numbers,
+                    "lap_starts": timestamps[lap_changes],
+                    "lap_numbers": lap_numbers[lap_changes],
                     "colour": self.hex_to_rgb(team_colour_hex),
                     "team": driver_info.get("TeamName", "Unknown"),
+                    "telemetry": channels,
                 }
 
             except Exception as e:
@@ -170,6 +233,16 @@ class RaceData:
 
         return int(self.lap_timeline[-1][2])
 
+    def laps_for_times(self, times):
+        starts = np.array([start for start, _, _ in self.lap_timeline], dtype=float)
+        ends = np.array([end for _, end, _ in self.lap_timeline], dtype=float)
+        lap_nums = np.array([lap for _, _, lap in self.lap_timeline], dtype=int)
+
+        session_times = np.asarray(times) + self.global_start
+        idx = np.clip(np.searchsorted(starts, session_times, side="right") - 1, 0, len(starts) - 1)
+        inside = (session_times >= starts[idx]) & (session_times < ends[idx])
+        return np.where(inside, lap_nums[idx], lap_nums[-1])
+
     def build_lap_position_map(self):
         if self.session and hasattr(self.session, "laps"):
             valid = self.session.laps[['DriverNumber', 'LapNumber', 'Position']].dropna()
@@ -204,6 +277,7 @@ class RaceData:
         # Normalise each driver timeline so replay time starts at 0
         for d in self.driver_data.values():
             d["timestamps"] = d["timestamps"] - global_start
+            d["lap_starts"] = d["lap_starts"] - global_start
 
         max_time = race_duration
         print(
@@ -211,45 +285,54 @@ class RaceData:
             f"frame interval: {self.frame_interval:.2f}s"
         )
 
-        current_time = 0.0
-        while current_time <= max_time:
-            frame_lap = self.lap_for_time(current_time)
-            frame = {
-                "time": current_time,
-                "drivers": {},
-            }
-
-            for driver_number, data in self.driver_data.items():
-                ts = data["timestamps"]
-
-                if current_time <= ts[-1]:
-                    x_pos = np.interp(current_time, ts, data["x"])
-                    y_pos = np.interp(current_time, ts, data["y"])
-
-                    active = True
-                else:
-                    x_pos = data["x"][-1]
-                    y_pos = data["y"][-1]
-                    lap = int(data["lap_numbers"][-1])
-                    active = False
-
-                frame["drivers"][driver_number] = {
-                    "x": x_pos,
-                    "y": y_pos,
-                    "lap": frame_lap,
-                    "abbreviation": data["abbreviation"],
-                    "colour": data["colour"],
-                    "active": active,
-                }
-
-            self.frames.append(frame)
-            current_time += self.frame_interval
+        frame_count = int(max_time / self.frame_interval + 1e-9) + 1
+        times = np.arange(frame_count) * self.frame_interval
+        laps = self.laps_for_times(times)
+        if self.frame_mode == "adaptive":
+            self.frames = build_adaptive_frames(self.driver_data, self.frame_interval, frame_count, laps, FRAME_TOLERANCE)
+        else:
+            self.frames = build_compact_frames(self.driver_data, times, laps)
 
         print(
             f"Generated {len(self.frames)} frames "
-            f"({max_time:.1f}s race duration)"
+            f"({max_time:.1f}s race duration, {self.frame_mode} storage "
+            f"{self.frames.nbytes / 1e6:.1f} MB)"
         )
 
+    def build_telemetry_pyramids(self):
+        laps = self.session.laps
+
+        for driver_number, data in self.driver_data.items():
+            ts = data["timestamps"]
+            # The raw channels are only needed to build the pyramids
+            channels = data.pop("telemetry", {})
+            if len(ts) < 2:
+                continue
+
+            self.telemetry_pyramids[driver_number] = {
+                channel: ChannelPyramid(ts, np.nan_to_num(values))
+                for channel, values in channels.items()
+            }
+            driver_laps = laps[laps["DriverNumber"] == driver_number]
+            lap_starts = driver_laps["LapStartTime"].dt.total_seconds().to_numpy(dtype=float) - self.global_start
+            self.driver_lap_bounds[driver_number] = lap_bounds(lap_starts, ts[-1])
+
+        print(f"Telemetry pyramids built for {len(self.telemetry_pyramids)} drivers")
+
+    def release_raw_positions(self):
+        # Frames now hold every position the replay draws, so the full-rate arrays can go
+        for data in self.driver_data.values():
+            data["end_time"] = float(data["timestamps"][-1]) if len(data["timestamps"]) else 0.0
+            for key in ("timestamps", "x", "y", "telemetry"):
+                data.pop(key, None)
+
+    def get_mini_sectors(self):
+        if self.mini_sectors is None:
+            print("Computing mini-sectors...")
+            self.mini_sectors = MiniSectors(self)
+            print(f"Mini-sectors computed over {self.mini_sectors.lap_count} laps")
+        return self.mini_sectors
+
     def build_position_timeline(self):
         laps = self.session.laps.copy()
 
@@ -286,7 +369,7 @@ class RaceData:
             end_times[:-1] = start_times[1:]
 
             if driver in self.driver_data:
-                last = self.driver_data[driver]["timestamps"].max() + self.global_start
+                last = self.driver_data[driver]["end_time"] + self.global_start
             else:
                 last = start_times[-1] + 200.0 
             
@@ -358,6 +441,10 @@ class RaceData:
             if driver_str in self.driver_compounds:
                 current_compound = self.driver_compounds[driver_str].get(lap_now, "UNKNOWN")
             
+            stint, tyre_age = None, None
+            if driver_str in self.driver_stints:
+                stint, tyre_age = self.driver_stints[driver_str].get(lap_now, (None, None))
+
             is_pitting = False
             if driver_str in self.pit_windows:
                 for start, end in self.pit_windows[driver_str]:
@@ -383,6 +470,8 @@ class RaceData:
                 "lap": lap_now,
                 "team": info.get("TeamName", "Unknown"),
                 "Compound" : current_compound,
+                "Stint": stint,
+                "TyreAge": tyre_age,
                 "DNF": show_dnf,
                 "Pitting": is_pitting,
                 "Gap": gap_display
@@ -411,6 +500,16 @@ class RaceData:
                 
                 self.driver_compounds[driver_num][lap_number] = compound
     
+    def build_stint_map(self):
+        self.driver_stints = {}
+        if self.session and hasattr(self.session, "laps"):
+            stints = stint_laps(self.session.laps)
+            for driver_num, driver_laps in stints.groupby("DriverNumber"):
+                self.driver_stints[str(driver_num)] = dict(zip(
+                    driver_laps["LapNumber"].tolist(),
+                    zip(driver_laps["Stint"].tolist(), driver_laps["TyreAge"].tolist()),
+                ))
+
     def build_pit_windows(self):
         if self.session and hasattr(self.session, "laps"):
             pit_laps = self.session.laps[~self.session.laps["PitInTime"].isna()].copy()
@@ -0,0 +1,351 @@
+import argparse
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+from race_data import RaceData, FRAME_TOLERANCE
+
+SNAPSHOT_FILE = "regression_snapshot.json"
+
+POSITION_SAMPLES = 40
+LEADERBOARD_SAMPLES = 40
+TELEMETRY_HZ = 4.0
+SESSION_OFFSET_S = 3600.0
+
+TOLERANCES = {
+    "compact": {"position": 0.01, "time": 1e-6, "gap": 1e-3},
+    # Adaptive frames are allowed to move a car by up to the storage tolerance
+    "adaptive": {"position": FRAME_TOLERANCE + 0.01, "time": 1e-6, "gap": 1e-3},
+}
+
+TIMED_STEPS = (
+    "load_drivers",
+    "align_timelines_and_generate_frames",
+    "build_lap_position_map",
+    "build_position_timeline",
+    "build_pit_windows",
+    "build_gap_timeline",
+    "build_stint_map",
+)
+
+
+class SyntheticLaps(pd.DataFrame):
+    _metadata = ["telemetry"]
+
+    @property
+    def _constructor(self):
+        return SyntheticLaps
+
+    def pick_drivers(self, driver):
+        return self[self["DriverNumber"] == str(driver)]
+
+    def pick_laps(self, lap_number):
+        return self[self["LapNumber"] == lap_number]
+
+    def pick_fastest(self):
+        return self.loc[[self["LapTime"].idxmin()]]
+
+    def get_telemetry(self):
+        parts = []
+        for _, lap in self.iterrows():
+            tel = self.telemetry[lap["DriverNumber"]]
+            mask = (tel["SessionTime"] >= lap["LapStartTime"]) & (tel["SessionTime"] <= lap["Time"])
+            parts.append(tel[mask])
+        if not parts:
+            return None
+        return pd.concat(parts).drop_duplicates(subset="SessionTime").reset_index(drop=True)
+
+
+class SyntheticSession:
+    # A small deterministic race: an elliptical track, one pit stop per driver and one retirement
+    def __init__(self, driver_count=10, lap_count=20, seed=7):
+        rng = np.random.default_rng(seed)
+        self.total_laps = lap_count
+        self.event = {"EventName": "Synthetic Grand Prix", "Location": "Synthetic"}
+        self.drivers = [str(n) for n in range(1, driver_count + 1)]
+        self.driver_info = {
+            d: {
+                "Abbreviation": f"D{int(d):02d}",
+                "TeamColor": f"{(40 * i) % 256:02X}{(90 + 17 * i) % 256:02X}C8",
+                "TeamName": f"Team {i // 2 + 1}",
+            }
+            for i, d in enumerate(self.drivers)
+        }
+
+        self.pit_stop_times = []
+        lap_rows = []
+        telemetry = {}
+        retired = self.drivers[-1]
+        retire_lap = lap_count // 2
+
+        for i, driver in enumerate(self.drivers):
+            pit_lap = 6 + i % 8
+            base = 80.0 + 0.25 * i
+            durations = base + 0.04 * np.arange(lap_count) + rng.normal(0.0, 0.15, lap_count)
+            durations[pit_lap] += 20.0
+
+            starts = SESSION_OFFSET_S + 0.2 * i + np.r_[0.0, np.cumsum(durations)[:-1]]
+            ends = starts + durations
+            laps_done = retire_lap if driver == retired else lap_count
+
+            for lap in range(laps_done):
+                stint = 1 if lap < pit_lap else 2
+                lap_rows.append({
+                    "Driver": self.driver_info[driver]["Abbreviation"],
+                    "DriverNumber": driver,
+                    "LapNumber": float(lap + 1),
+                    "LapStartTime": pd.Timedelta(seconds=starts[lap]),
+                    "Time": pd.Timedelta(seconds=ends[lap]),
+                    "LapTime": pd.Timedelta(seconds=durations[lap]),
+                    "Stint": float(stint),
+                    "Compound": "MEDIUM" if stint == 1 else "HARD",
+                    "TyreLife": float(lap + 1 if stint == 1 else lap - pit_lap + 1),
+                    "PitInTime": pd.Timedelta(seconds=ends[lap] - 3.0) if lap == pit_lap - 1 else pd.NaT,
+                    "PitOutTime": pd.Timedelta(seconds=starts[lap] + 17.0) if lap == pit_lap else pd.NaT,
+                    "TrackStatus": "1",
+                    "Deleted": False,
+                })
+            if pit_lap - 1 < laps_done:
+                self.pit_stop_times.append(ends[pit_lap - 1] - SESSION_OFFSET_S)
+
+            finish = ends[laps_done - 1] if driver != retired else starts[laps_done] + durations[laps_done] / 2
+            telemetry[driver] = self.build_telemetry(starts, durations, starts[0], finish)
+
+        laps = SyntheticLaps(lap_rows)
+        laps["Position"] = laps.groupby("LapNumber")["Time"].rank(method="first")
+        laps.telemetry = telemetry
+        self.laps = laps
+
+        final = laps.sort_values(["LapNumber", "Time"], ascending=[False, True]).drop_duplicates("DriverNumber")
+        self.results = pd.DataFrame({
+            "DriverNumber": self.drivers,
+            "Status": ["Retired" if d == retired else "Finished" for d in self.drivers],
+            "GridPosition": [float(i + 1) for i in range(driver_count)],
+            "Position": [float(final["DriverNumber"].tolist().index(d) + 1) for d in self.drivers],
+        })
+
+    def build_telemetry(self, starts, durations, begin, finish):
+        t = np.arange(begin, finish, 1.0 / TELEMETRY_HZ)
+        lap_idx = np.clip(np.searchsorted(starts, t, side="right") - 1, 0, len(starts) - 1)
+        fraction = np.clip((t - starts[lap_idx]) / durations[lap_idx], 0.0, 1.0)
+        angle = 2 * np.pi * fraction
+        speed = 3.6 * 2 * np.pi * 480.0 / durations[lap_idx]
+
+        return pd.DataFrame({
+            "SessionTime": pd.to_timedelta(t, unit="s"),
+            "Time": pd.to_timedelta(t - begin, unit="s"),
+            "X": 6000.0 * np.cos(angle),
+            "Y": 3500.0 * np.sin(angle),
+            "Speed": speed,
+            "Throttle": np.full(len(t), 100.0),
+            "Brake": np.zeros(len(t), dtype=bool),
+            "nGear": np.full(len(t), 7),
+            "RPM": 11000.0 + 500.0 * np.sin(angle * 3),
+            "Distance": (lap_idx + fraction) * 2 * np.pi * 480.0,
+        })
+
+    def load(self, **kwargs):
+        pass
+
+    def get_circuit_info(self):
+        return SimpleNamespace(rotation=0.0, corners=pd.DataFrame({"Number": range(1, 5)}))
+
+    def get_driver(self, driver):
+        return self.driver_info[str(driver)]
+
+
+class SyntheticRaceData(RaceData):
+    def __init__(self, session, frame_mode):
+        self.synthetic_session = session
+        self.timings = {}
+        for name in TIMED_STEPS:
+            setattr(self, name, self.timed(name, getattr(self, name)))
+        super().__init__(2000, "Synthetic", "R", telemetry=False, frame_mode=frame_mode)
+
+    def load_session(self):
+        self.session = self.synthetic_session
+
+    def timed(self, name, method):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            result = method(*args, **kwargs)
+            self.timings[name] = time.perf_counter() - start
+            return result
+        return wrapper
+
+
+def sample_times(race, session):
+    duration = race.frames.duration
+    times = np.linspace(0.0, duration, LEADERBOARD_SAMPLES).tolist()
+    # Land some samples inside pit windows so the pitting flag is exercised
+    times += [t + 5.0 for t in session.pit_stop_times]
+    return sorted(round(t, 3) for t in times)
+
+
+def snapshot_positions(race):
+    indices = np.linspace(0, len(race.frames) - 1, POSITION_SAMPLES).astype(int).tolist()
+    samples = []
+    for idx in indices:
+        frame = race.frames[idx]
+        samples.append({
+            "time": frame["time"],
+            "drivers": {
+                d: [v["x"], v["y"], v["active"], v["lap"]] for d, v in frame["drivers"].items()
+            },
+        })
+    return samples
+
+
+def snapshot_leaderboard(race, times):
+    rows = []
+    for t in times:
+        rows.append({
+            "time": t,
+            "entries": [
+                [e["driver_number"], e["Position"], e["DNF"], e["Pitting"], e["Gap"], e["Compound"], e["lap"], e["Stint"], e["TyreAge"]]
+                for e in race.get_leaderboard(t)
+            ],
+        })
+    return rows
+
+
+def take_snapshot(race, session):
+    start = time.perf_counter()
+    positions = snapshot_positions(race)
+    position_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    leaderboard = snapshot_leaderboard(race, sample_times(race, session))
+    leaderboard_time = time.perf_counter() - start
+
+    snapshot = {
+        "positions": positions,
+        "leaderboard": leaderboard,
+        "pit_windows": {d: [list(w) for w in windows] for d, windows in race.pit_windows.items()},
+    }
+    timings = dict(race.timings, sample_positions=position_time, sample_leaderboard=leaderboard_time)
+    return snapshot, timings
+
+
+def compare_positions(expected, actual, tol):
+    errors = []
+    worst = 0.0
+    for exp, act in zip(expected, actual):
+        if abs(exp["time"] - act["time"]) > tol["time"]:
+            errors.append(f"frame time {act['time']} != {exp['time']}")
+        for driver, (ex, ey, e_active, e_lap) in exp["drivers"].items():
+            if driver not in act["drivers"]:
+                errors.append(f"t={exp['time']:.1f} driver {driver} missing")
+                continue
+            ax, ay, a_active, a_lap = act["drivers"][driver]
+            worst = max(worst, float(np.hypot(ax - ex, ay - ey)))
+            if a_active != e_active or a_lap != e_lap:
+                errors.append(f"t={exp['time']:.1f} driver {driver}: active/lap {a_active}/{a_lap} != {e_active}/{e_lap}")
+
+    if len(expected) != len(actual):
+        errors.append(f"{len(actual)} position samples, expected {len(expected)}")
+    if worst > tol["position"]:
+        errors.append(f"max position error {worst:.3f} > {tol['position']}")
+    return errors, f"max err {worst:.3f}"
+
+
+def gap_value(text):
+    if text in ("", "Leader"):
+        return text
+    return float(text)
+
+
+def compare_leaderboard(expected, actual, tol):
+    errors = []
+    for exp, act in zip(expected, actual):
+        if [e[:4] for e in exp["entries"]] != [a[:4] for a in act["entries"]]:
+            errors.append(f"t={exp['time']:.1f}: order/DNF/pitting differ")
+            continue
+        for e, a in zip(exp["entries"], act["entries"]):
+            eg, ag = gap_value(e[4]), gap_value(a[4])
+            if isinstance(eg, float) and isinstance(ag, float):
+                gap_ok = abs(eg - ag) <= tol["gap"]
+            else:
+                gap_ok = eg == ag
+            if not gap_ok or e[5:] != a[5:]:
+                errors.append(f"t={exp['time']:.1f} driver {e[0]}: {a[4:]} != {e[4:]}")
+
+    if len(expected) != len(actual):
+        errors.append(f"{len(actual)} leaderboard samples, expected {len(expected)}")
+    return errors, f"{len(actual)} samples"
+
+
+def compare_pit_windows(expected, actual, tol):
+    errors = []
+    for driver in sorted(set(expected) | set(actual)):
+        exp, act = expected.get(driver, []), actual.get(driver, [])
+        if len(exp) != len(act):
+            errors.append(f"driver {driver}: {len(act)} windows, expected {len(exp)}")
+            continue
+        for (es, ee), (as_, ae) in zip(exp, act):
+            if abs(es - as_) > tol["time"] or abs(ee - ae) > tol["time"]:
+                errors.append(f"driver {driver}: window ({as_:.3f}, {ae:.3f}) != ({es:.3f}, {ee:.3f})")
+    return errors, f"{sum(len(w) for w in actual.values())} windows"
+
+
+CHECKS = (
+    ("positions", compare_positions, ("align_timelines_and_generate_frames", "sample_positions")),
+    ("leaderboard", compare_leaderboard, ("build_position_timeline", "build_gap_timeline", "build_stint_map", "sample_leaderboard")),
+    ("pit_windows", compare_pit_windows, ("build_pit_windows",)),
+)
+
+
+def run_checks(golden, snapshot, timings, mode):
+    failed = False
+    tol = TOLERANCES[mode]
+    for name, compare, timed in CHECKS:
+        errors, detail = compare(golden[name], snapshot[name], tol)
+        elapsed = sum(timings.get(step, 0.0) for step in timed)
+        status = "FAIL" if errors else "ok"
+        print(f"  [{mode}] {name:<12} {status:<4} {detail:<22} {elapsed * 1000:9.1f} ms")
+        for error in errors[:10]:
+            print(f"      {error}")
+        if len(errors) > 10:
+            print(f"      ... {len(errors) - 10} more")
+        failed |= bool(errors)
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Golden-output regression and timing checks for RaceData")
+    parser.add_argument("--update", action="store_true", help="rewrite the snapshot from the compact frame store")
+    parser.add_argument("--mode", choices=("compact", "adaptive", "both"), default="both")
+    parser.add_argument("--snapshot", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), SNAPSHOT_FILE))
+    args = parser.parse_args()
+
+    session = SyntheticSession()
+
+    if args.update:
+        race = SyntheticRaceData(session, "compact")
+        snapshot, _ = take_snapshot(race, session)
+        with open(args.snapshot, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        print(f"Snapshot written to {args.snapshot}")
+        return
+
+    with open(args.snapshot, "r", encoding="utf-8") as f:
+        golden = json.load(f)
+
+    modes = ("compact", "adaptive") if args.mode == "both" else (args.mode,)
+    failed = False
+    for mode in modes:
+        start = time.perf_counter()
+        race = SyntheticRaceData(session, mode)
+        print(f"{mode}: RaceData built in {time.perf_counter() - start:.3f}s, frames {race.frames.nbytes / 1e6:.2f} MB")
+        # Round-trip through JSON so both sides compare the same types
+        snapshot, timings = take_snapshot(race, session)
+        failed |= run_checks(golden, json.loads(json.dumps(snapshot)), timings, mode)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import pygame
+
+
+class SceneItem:
+    def __init__(self, key, rect, signature, draw):
+        self.key = key
+        self.rect = rect
+        self.signature = signature
+        self.draw = draw
+
+
+class DirtyRegions:
+    def __init__(self, screen_rect):
+        self.screen_rect = screen_rect
+        self.previous = {}
+        self.full = True
+
+    def invalidate(self):
+        self.full = True
+
+    def damaged(self, items):
+        damaged = []
+        current = {}
+
+        for item in items:
+            current[item.key] = (item.rect, item.signature)
+            old = self.previous.get(item.key)
+            if old is None:
+                damaged.append(item.rect)
+            elif old[0] != item.rect or old[1] != item.signature:
+                damaged.append(old[0])
+                damaged.append(item.rect)
+
+        for key, (rect, _) in self.previous.items():
+            if key not in current:
+                damaged.append(rect)
+
+        self.previous = current
+
+        if self.full:
+            self.full = False
+            return [self.screen_rect.copy()]
+
+        return merge_rects([r.clip(self.screen_rect) for r in damaged if r.width and r.height])
+
+
+def merge_rects(rects):
+    merged = []
+    for rect in rects:
+        rect = rect.copy()
+        hit = rect.collidelist(merged)
+        while hit != -1:
+            rect.union_ip(merged.pop(hit))
+            hit = rect.collidelist(merged)
+        merged.append(rect)
+
+    return [r for r in merged if r.width and r.height]
+
+
+def draw_scene(screen, draw_background, items, regions=None):
+    if regions is None:
+        draw_background(screen)
+        for item in items:
+            item.draw(screen)
+        return
+
+    for region in regions:
+        screen.set_clip(region)
+        draw_background(screen)
+        for item in items:
+            if item.rect.colliderect(region):
+                item.draw(screen)
+
+    screen.set_clip(None)
@@ -0,0 +1,94 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+MINI_SECTOR_COUNT = 50
+
+
+def project_to_track(track_x, track_y, track_s, xs, ys):
+    # Nearest track point by k-d tree; scipy already comes with fastf1
+    tree = cKDTree(np.column_stack((track_x, track_y)))
+    _, nearest = tree.query(np.column_stack((xs, ys)))
+    return track_s[nearest]
+
+
+def boundary_crossings(s, timestamps, track_length, segment_length):
+    # Undo the wrap at the start/finish line so distance keeps growing lap after lap
+    ds = np.diff(s)
+    ds[ds < -track_length / 2] += track_length
+    ds[ds > track_length / 2] -= track_length
+    travelled = np.maximum.accumulate(np.concatenate(([s[0]], s[0] + np.cumsum(ds))))
+
+    first = int(np.ceil(travelled[0] / segment_length))
+    last = int(np.floor(travelled[-1] / segment_length))
+    if last <= first:
+        return np.empty(0, dtype=int), np.empty(0)
+
+    boundaries = np.arange(first, last + 1)
+    return boundaries, np.interp(boundaries * segment_length, travelled, timestamps)
+
+
+class MiniSectors:
+    def __init__(self, race, count=MINI_SECTOR_COUNT):
+        self.count = count
+        self.track_length = race.track_length
+        self.segment_length = race.track_length / count
+        self.drivers = list(race.driver_data.keys())
+
+        # Positions come from the frame store, the full-rate samples are released after loading
+        trajectories = [race.frames.trajectory(d) for d in self.drivers]
+        lengths = [len(t) for t, _, _ in trajectories]
+        xs = np.concatenate([x for _, x, _ in trajectories]) if trajectories else np.empty(0)
+        ys = np.concatenate([y for _, _, y in trajectories]) if trajectories else np.empty(0)
+        s_all = project_to_track(race.track_x, race.track_y, race.track_s, xs, ys)
+
+        results = []
+        for s, (timestamps, _, _), driver in zip(np.split(s_all, np.cumsum(lengths)[:-1]), trajectories, self.drivers):
+            if len(s) < 2:
+                results.append((np.empty(0, dtype=int), np.empty(0, dtype=int), np.empty(0)))
+                continue
+
+            boundaries, crossings = boundary_crossings(s, timestamps, self.track_length, self.segment_length)
+            # Each segment belongs to the timing lap the car was on halfway through it
+            data = race.driver_data[driver]
+            midpoints = (crossings[:-1] + crossings[1:]) / 2
+            change = np.clip(np.searchsorted(data["lap_starts"], midpoints, side="right") - 1, 0, None)
+            laps = np.nan_to_num(np.asarray(data["lap_numbers"], dtype=float)[change]).astype(int)
+            results.append((boundaries[:-1] % count, laps, np.diff(crossings)))
+
+        self.laps = np.unique(np.concatenate([laps for _, laps, _ in results])) if results else np.empty(0, dtype=int)
+        self.lap_count = len(self.laps)
+        self.times = np.full((len(self.drivers), self.lap_count, count), np.nan)
+        for i, (sectors, laps, seg_times) in enumerate(results):
+            self.times[i, np.searchsorted(self.laps, laps), sectors] = seg_times
+
+        self.track_point_sectors = self.track_sectors(race.track_s)
+        self.dominance_cache = {}
+
+    def track_sectors(self, track_s):
+        return np.minimum((track_s // self.segment_length).astype(int), self.count - 1)
+
+    def dominance(self, lap=None, drivers=None):
+        key = (lap, tuple(drivers) if drivers else None)
+        if key in self.dominance_cache:
+            return self.dominance_cache[key]
+
+        rows = np.arange(len(self.drivers))
+        if drivers:
+            rows = np.array([self.drivers.index(d) for d in drivers if d in self.drivers], dtype=int)
+
+        times = np.where(np.isnan(self.times[rows]), np.inf, self.times[rows])
+        if lap is None:
+            best = times.min(axis=1) if self.lap_count else np.full((len(rows), self.count), np.inf)
+        elif lap in self.laps:
+            best = times[:, int(np.searchsorted(self.laps, lap)), :]
+        else:
+            best = np.full((len(rows), self.count), np.inf)
+
+        if len(rows) == 0:
+            winners = np.full(self.count, -1, dtype=int)
+        else:
+            winners = rows[best.argmin(axis=0)]
+            winners[np.isinf(best.min(axis=0))] = -1
+
+        self.dominance_cache[key] = winners
+        return winners
@@ -0,0 +1,48 @@
+import importlib
+import sys
+import threading
+import time
+
+# Everything the replay needs that pulls in numpy, pandas or fastf1
+HEAVY_MODULES = ("numpy", "pandas", "fastf1", "race_data", "camera", "telemetry", "comparison", "sectors")
+
+PROCESS_START = time.perf_counter()
+
+
+class BackgroundImporter(threading.Thread):
+    def __init__(self, modules=HEAVY_MODULES):
+        super().__init__(name="background-importer", daemon=True)
+        self.modules = modules
+        self.error = None
+        self.elapsed = None
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            for name in self.modules:
+                importlib.import_module(name)
+        except Exception as e:
+            self.error = e
+        self.elapsed = time.perf_counter() - start
+
+    @property
+    def started(self):
+        return self.ident is not None
+
+    @property
+    def ready(self):
+        return self.started and not self.is_alive()
+
+    def wait(self):
+        if not self.started:
+            self.start()
+        if self.is_alive():
+            print("Waiting for data libraries to finish loading...")
+        self.join()
+        if self.error is not None:
+            raise self.error
+        print(f"Data libraries loaded in {self.elapsed:.2f}s")
+
+
+def loaded_heavy_modules(modules=HEAVY_MODULES, preloaded=()):
+    return [name for name in modules if name in sys.modules and name not in preloaded]
@@ -0,0 +1,130 @@
+import numpy as np
+import pygame
+
+TELEMETRY_CHANNELS = ("Speed", "Throttle", "Brake", "nGear", "RPM")
+TELEMETRY_DT = 0.2
+
+CHANNEL_COLOURS = {
+    "Speed": (80, 200, 255),
+    "Throttle": (80, 220, 120),
+    "Brake": (240, 80, 80),
+    "nGear": (230, 200, 80),
+    "RPM": (200, 120, 240),
+}
+
+
+class ChannelPyramid:
+    def __init__(self, timestamps, values, dt=TELEMETRY_DT):
+        self.dt = dt
+        self.start = float(timestamps[0])
+
+        count = max(1, int((timestamps[-1] - timestamps[0]) / dt) + 1)
+        values = np.asarray(values, dtype=np.float32)
+
+        # Level 0 reduces the raw samples in each bin, so short spikes between grid points survive;
+        # bins with no sample fall back to the interpolated value at their centre
+        bins = np.minimum(((np.asarray(timestamps) - self.start) // dt).astype(np.int64), count - 1)
+        starts = np.flatnonzero(np.r_[True, np.diff(bins) != 0])
+        filled = bins[starts]
+        centres = self.start + (np.arange(count) + 0.5) * dt
+        mins = np.interp(centres, timestamps, values).astype(np.float32)
+        maxs = mins.copy()
+        mins[filled] = np.minimum.reduceat(values, starts)
+        maxs[filled] = np.maximum.reduceat(values, starts)
+
+        # Each level halves the previous one, keeping the min and max of every pair
+        self.levels = [(mins, maxs)]
+        while len(mins) > 1:
+            if len(mins) % 2:
+                mins = np.append(mins, mins[-1])
+                maxs = np.append(maxs, maxs[-1])
+            mins = np.minimum(mins[0::2], mins[1::2])
+            maxs = np.maximum(maxs[0::2], maxs[1::2])
+            self.levels.append((mins, maxs))
+
+        self.value_min = float(mins[0])
+        self.value_max = float(maxs[0])
+
+    def window(self, t0, t1, columns):
+        if t1 <= t0 or columns <= 0:
+            return None
+
+        per_column = (t1 - t0) / columns
+        level = int(np.log2(max(per_column / self.dt, 1.0)))
+        level = min(level, len(self.levels) - 1)
+        bin_dt = self.dt * (2 ** level)
+        mins, maxs = self.levels[level]
+
+        first = max(0, int((t0 - self.start) // bin_dt))
+        last = min(len(mins), int(np.ceil((t1 - self.start) / bin_dt)))
+        if last <= first:
+            return None
+
+        bin_centres = self.start + (np.arange(first, last) + 0.5) * bin_dt
+        cols = np.clip(((bin_centres - t0) / per_column).astype(int), 0, columns - 1)
+        starts = np.flatnonzero(np.r_[True, np.diff(cols) != 0])
+
+        col_min = np.minimum.reduceat(mins[first:last], starts)
+        col_max = np.maximum.reduceat(maxs[first:last], starts)
+        return cols[starts], col_min, col_max
+
+
+def lap_bounds(lap_starts, end_time):
+    starts = np.sort(lap_starts[~np.isnan(lap_starts)])
+    starts = starts[starts < end_time]
+    return np.append(starts, end_time)
+
+
+def lap_window(bounds, time):
+    if len(bounds) < 2:
+        return None
+
+    idx = int(np.searchsorted(bounds, time, side="right")) - 1
+    idx = min(max(idx, 0), len(bounds) - 2)
+    return float(bounds[idx]), float(bounds[idx + 1])
+
+
+def draw_telemetry_panel(screen, rect, pyramids, t0, t1, current_time, font, title=""):
+    pygame.draw.rect(screen, (25, 25, 25), rect, border_radius=5)
+    pygame.draw.rect(screen, (180, 180, 180), rect, 2, border_radius=5)
+
+    if title:
+        screen.blit(font.render(title, True, (255, 255, 255)), (rect.x + 10, rect.y + 6))
+
+    channels = [c for c in TELEMETRY_CHANNELS if c in pyramids]
+    if not channels:
+        return
+
+    top = rect.y + 26
+    strip_h = (rect.bottom - 6 - top) // len(channels)
+    plot_x = rect.x + 70
+    plot_w = rect.right - 10 - plot_x
+
+    for i, channel in enumerate(channels):
+        pyramid = pyramids[channel]
+        strip = pygame.Rect(plot_x, top + i * strip_h, plot_w, strip_h - 4)
+        pygame.draw.rect(screen, (40, 40, 40), strip)
+        screen.blit(font.render(channel, True, (200, 200, 200)), (rect.x + 10, strip.y))
+
+        data = pyramid.window(t0, t1, plot_w)
+        if data is None:
+            continue
+
+        cols, col_min, col_max = data
+        value_range = (pyramid.value_max - pyramid.value_min) or 1.0
+        xs = strip.x + cols
+        top_ys = strip.bottom - (col_max - pyramid.value_min) / value_range * strip.height
+        bottom_ys = strip.bottom - (col_min - pyramid.value_min) / value_range * strip.height
+
+        # Envelope polygon: max trace left to right, then min trace back again
+        outline = np.concatenate((
+            np.column_stack((xs, top_ys)),
+            np.column_stack((xs[::-1], bottom_ys[::-1] + 1)),
+        ))
+        colour = CHANNEL_COLOURS.get(channel, (200, 200, 200))
+        if len(outline) > 2:
+            pygame.draw.polygon(screen, colour, outline.tolist())
+
+    if t0 <= current_time <= t1:
+        cursor_x = plot_x + int((current_time - t0) / (t1 - t0) * plot_w)
+        pygame.draw.line(screen, (255, 255, 255), (cursor_x, top), (cursor_x, rect.bottom - 6), 1)